@@ -0,0 +1,119 @@
+# arbol.py
+from array import array
+from itertools import repeat
+
+from tabla_compilada import ids_de_tokens, reconocer_ids
+
+
+class ArbolSintactico:
+    """
+    Árbol de derivación guardado en preorden como arrays paralelos de enteros:
+    simbolos[i] es el código del símbolo del nodo i, producciones[i] la producción aplicada
+    (-1 en hojas terminales o no terminales sin expandir) y tamanos[i] el número de nodos
+    de su subárbol. Los hijos de i empiezan en i + 1 y cada uno salta su propio tamaño.
+    """
+
+    __slots__ = ("compilada", "simbolos", "producciones", "tamanos")
+
+    def __init__(self, compilada, simbolos, producciones, tamanos):
+        self.compilada = compilada
+        self.simbolos = simbolos
+        self.producciones = producciones
+        self.tamanos = tamanos
+
+    def __len__(self):
+        return len(self.simbolos)
+
+    def nombre(self, nodo):
+        s = self.simbolos[nodo]
+        num_t = len(self.compilada.terminales)
+        return self.compilada.terminales[s] if s < num_t else self.compilada.no_terminales[s - num_t]
+
+    def hijos(self, nodo):
+        hijo = nodo + 1
+        fin = nodo + self.tamanos[nodo]
+        while hijo < fin:
+            yield hijo
+            hijo += self.tamanos[hijo]
+
+    def hojas(self):
+        """
+        Índices de las hojas terminales, en el orden de los tokens de la entrada.
+        """
+        num_t = len(self.compilada.terminales)
+        return (i for i, s in enumerate(self.simbolos) if s < num_t)
+
+    def a_plano(self):
+        """
+        El árbol como listas planas en preorden, serializable a JSON a cualquier profundidad:
+        nombre del símbolo, producción aplicada (-1 en hojas) y tamaño del subárbol de cada nodo.
+        """
+        return {
+            "simbolos": [self.nombre(nodo) for nodo in range(len(self))],
+            "producciones": self.producciones.tolist(),
+            "tamanos": self.tamanos.tolist(),
+        }
+
+    def a_anidado(self):
+        """
+        Convierte el árbol en tuplas (nombre, [hijos]) sin recursión; pensado para árboles
+        pequeños o para depurar.
+        """
+        if not self.simbolos:
+            return None
+        convertidos = [None] * len(self)
+        for nodo in range(len(self) - 1, -1, -1):
+            convertidos[nodo] = (self.nombre(nodo), [convertidos[h] for h in self.hijos(nodo)])
+        return convertidos[0]
+
+
+def construir_arbol(derivacion, compilada):
+    """
+    Reconstruye el árbol a partir de la derivación más a la izquierda. El preorden del árbol
+    es justamente el orden en que la derivación expande los símbolos.
+    """
+    num_t = len(compilada.terminales)
+    empujes = compilada.empujes
+    largos = [len(e) for e in empujes]
+    total = len(derivacion)
+    simbolos = array("i")
+    producciones = array("i")
+    padres = array("i")
+    agregar_simbolo = simbolos.append
+    agregar_produccion = producciones.append
+    agregar_padre = padres.append
+
+    pila_simbolos = [compilada.inicio]
+    pila_padres = [-1]
+    k = 0
+    nodo = 0
+    while pila_simbolos:
+        s = pila_simbolos.pop()
+        agregar_simbolo(s)
+        agregar_padre(pila_padres.pop())
+        if s >= num_t and k < total:
+            prod = derivacion[k]
+            k += 1
+            agregar_produccion(prod)
+            pila_simbolos.extend(empujes[prod])
+            pila_padres.extend(repeat(nodo, largos[prod]))
+        else:
+            agregar_produccion(-1)
+        nodo += 1
+
+    tamanos = array("i", [1]) * nodo
+    for hijo in range(nodo - 1, 0, -1):
+        tamanos[padres[hijo]] += tamanos[hijo]
+    return ArbolSintactico(compilada, simbolos, producciones, tamanos)
+
+
+def analizar_arbol(cadena, compilada):
+    """
+    Analiza una cadena de tokens separados por espacios y devuelve
+    (valida, posicion, mensaje, arbol); con error el árbol es parcial.
+    """
+    tokens = cadena.split()
+    derivacion = array("i")
+    valida, posicion, mensaje = reconocer_ids(ids_de_tokens(tokens, compilada), compilada,
+                                              derivacion=derivacion, tokens=tokens)
+    return valida, posicion, mensaje, construir_arbol(derivacion, compilada)
@@ -0,0 +1,197 @@
+# benchmarks/ejecutar.py
+# Mide construcción de la gramática (por fases), velocidad de análisis y memoria máxima
+# sobre gramáticas sintéticas de tamaño creciente, y guarda los resultados en JSON.
+#
+# Uso:
+#   python benchmarks/ejecutar.py --salida base.json
+#   python benchmarks/ejecutar.py --comparar base.json
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import conjuntos  # noqa: E402
+from cargador import cargar_reglas  # noqa: E402
+from flujo import reconocer_flujo  # noqa: E402
+from parser import (  # noqa: E402
+    EPSILON, construir_tabla_ll1, extraer_variables_terminales, inicializar_gramatica,
+    reconocer_cadena
+)
+from tabla_compilada import compilar_tabla, reconocer_compilado  # noqa: E402
+
+from gramaticas import generar_cadena, generar_gramatica, mutar_cadena, texto_gramatica  # noqa: E402
+
+
+def construir(texto):
+    """
+    Construye la tabla desde el texto de la gramática cronometrando cada fase.
+    """
+    fases = {}
+    t = time.perf_counter()
+    reglas = cargar_reglas(texto.splitlines())
+    fases["leer"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    variables, terminales = extraer_variables_terminales(reglas)
+    inicio = reglas[0][0]
+    grammar = inicializar_gramatica(variables, terminales, inicio)
+    conjuntos.calcular_first(reglas, grammar, EPSILON)
+    fases["first"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    conjuntos.calcular_follow(reglas, grammar, EPSILON)
+    fases["follow"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    tabla = construir_tabla_ll1(reglas, grammar, terminales)
+    fases["tabla"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    compilada = compilar_tabla(reglas, tabla, inicio)
+    fases["compilar"] = time.perf_counter() - t
+
+    return (reglas, grammar, tabla, terminales, inicio, compilada), fases
+
+
+def motores(analisis):
+    reglas, grammar, tabla, terminales, inicio, compilada = analisis
+    return {
+        "reconocer_cadena": lambda cadena: reconocer_cadena(cadena, tabla, grammar, inicio),
+        "reconocer_compilado": lambda cadena: reconocer_compilado(cadena, compilada),
+        "reconocer_flujo": lambda cadena: reconocer_flujo(cadena.split(), compilada),
+    }
+
+
+def mejor_tiempo(funcion, repeticiones):
+    mejor = float("inf")
+    resultado = None
+    for _ in range(repeticiones):
+        t = time.perf_counter()
+        obtenido = funcion()
+        t = time.perf_counter() - t
+        if t < mejor:
+            mejor, resultado = t, obtenido
+    return mejor, resultado
+
+
+def memoria_maxima(funcion):
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def ejecutar(args):
+    resultados = {
+        "entorno": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+        },
+        "parametros": vars(args).copy(),
+        "construccion": [],
+        "analisis": [],
+    }
+    resultados["parametros"].pop("salida")
+    resultados["parametros"].pop("comparar")
+
+    for n in args.no_terminales:
+        reglas = generar_gramatica(n, args.producciones, args.anulables, args.niveles, args.semilla)
+        texto = texto_gramatica(reglas)
+        total, (analisis, fases) = mejor_tiempo(lambda: construir(texto), args.repeticiones)
+        memoria = memoria_maxima(lambda: construir(texto))
+        resultados["construccion"].append({
+            "no_terminales": n,
+            "producciones": len(reglas),
+            "total_s": total,
+            "fases_s": fases,
+            "memoria_max_bytes": memoria,
+        })
+        print(f"[construcción] {n:>6} NT {len(reglas):>7} prod  {total * 1000:10.2f} ms  "
+              + "  ".join(f"{f}={v * 1000:.2f}" for f, v in fases.items()))
+
+        terminales = analisis[3]
+        for tokens in args.tokens:
+            valida = generar_cadena(reglas, tokens, args.profundidad, args.semilla)
+            invalida = mutar_cadena(valida, terminales, args.semilla)
+            for tipo, lista in (("valida", valida), ("invalida", invalida)):
+                cadena = " ".join(lista)
+                for motor, funcion in motores(analisis).items():
+                    t, veredicto = mejor_tiempo(lambda: funcion(cadena), args.repeticiones)
+                    memoria = memoria_maxima(lambda: funcion(cadena))
+                    consumidos = len(lista) if veredicto[0] else veredicto[1]
+                    resultados["analisis"].append({
+                        "no_terminales": n,
+                        "motor": motor,
+                        "entrada": tipo,
+                        "tokens": len(lista),
+                        "aceptada": veredicto[0],
+                        "tiempo_s": t,
+                        "tokens_por_s": consumidos / t if t > 0 else None,
+                        "memoria_max_bytes": memoria,
+                    })
+                    print(f"[análisis]     {n:>6} NT {tipo:<8} {len(lista):>8} tok  {motor:<20} "
+                          f"{t * 1000:10.2f} ms  {consumidos / t if t > 0 else 0:>12.0f} tok/s  "
+                          f"{memoria / 1024:>10.0f} KiB")
+    return resultados
+
+
+def clave(fila):
+    return tuple(fila.get(k) for k in ("no_terminales", "motor", "entrada", "tokens"))
+
+
+def comparar(actual, base, umbral):
+    """
+    Compara con una ejecución anterior y devuelve cuántas mediciones empeoraron más del umbral.
+    """
+    regresiones = 0
+    for seccion, campo in (("construccion", "total_s"), ("analisis", "tiempo_s")):
+        anteriores = {clave(f): f for f in base.get(seccion, [])}
+        for fila in actual[seccion]:
+            anterior = anteriores.get(clave(fila))
+            if not anterior or not anterior[campo]:
+                continue
+            razon = fila[campo] / anterior[campo]
+            marca = "REGRESIÓN" if razon > 1 + umbral else ""
+            regresiones += bool(marca)
+            print(f"[comparación] {seccion:<12} {str(clave(fila)):<60} x{razon:6.2f} {marca}")
+    return regresiones
+
+
+def lista_enteros(texto):
+    return [int(x) for x in texto.split(",")]
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Benchmarks del analizador LL(1)")
+    argumentos.add_argument("--no-terminales", type=lista_enteros, default=[10, 100, 1000])
+    argumentos.add_argument("--producciones", type=int, default=3)
+    argumentos.add_argument("--anulables", type=int, default=2)
+    argumentos.add_argument("--niveles", type=int, default=3)
+    argumentos.add_argument("--profundidad", type=int, default=6)
+    argumentos.add_argument("--tokens", type=lista_enteros, default=[1000, 10000, 100000])
+    argumentos.add_argument("--repeticiones", type=int, default=3)
+    argumentos.add_argument("--semilla", type=int, default=0)
+    argumentos.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    argumentos.add_argument("--comparar", help="JSON de una ejecución anterior")
+    argumentos.add_argument("--umbral", type=float, default=0.10,
+                            help="empeoramiento relativo a partir del cual se marca regresión")
+    args = argumentos.parse_args()
+
+    resultados = ejecutar(args)
+    if args.salida:
+        with open(args.salida, "w") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+    if args.comparar:
+        with open(args.comparar) as f:
+            base = json.load(f)
+        sys.exit(1 if comparar(resultados, base, args.umbral) else 0)
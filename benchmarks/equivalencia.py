@@ -0,0 +1,116 @@
+# benchmarks/equivalencia.py
+# Comprobaciones aleatorias de que los cálculos optimizados dan lo mismo que los de referencia:
+#   first_follow  conjuntos.calcular_first/calcular_follow frente al punto fijo de parser.py
+#   mutable       GramaticaMutable tras cada cambio frente a preparar_gramatica desde cero
+# Termina con código 1 y muestra el caso (reglas y cambios) en la primera diferencia.
+#
+# Uso:
+#   python benchmarks/equivalencia.py [--casos 2000] [--semilla 0] [--solo first_follow|mutable]
+import argparse
+import os
+import random
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import conjuntos  # noqa: E402
+import parser  # noqa: E402
+from gramatica_mutable import GramaticaMutable  # noqa: E402
+from parser import EPSILON, extraer_variables_terminales, inicializar_gramatica, preparar_gramatica  # noqa: E402
+
+VARIABLES = ["S", "A", "B", "C", "D"]
+TERMINALES = ["a", "b", "c"]
+
+
+def regla_aleatoria(rng, variables, izq=None):
+    der = [rng.choice(variables + TERMINALES) for _ in range(rng.randint(0, 3))]
+    return izq or rng.choice(variables), der or [EPSILON]
+
+
+def gramatica_aleatoria(rng):
+    """
+    Reglas con el inicial S primero; admite recursión, anulables y no terminales sin reglas.
+    """
+    variables = VARIABLES[:rng.randint(1, len(VARIABLES))]
+    reglas = [regla_aleatoria(rng, variables, "S")]
+    reglas += [regla_aleatoria(rng, variables) for _ in range(rng.randint(0, 8))]
+    return reglas
+
+
+def conjuntos_por_simbolo(grammar):
+    return {s: (d["tipo"], set(d["first"]), set(d.get("follow", ())))
+            for s, d in grammar.items()}
+
+
+def comprobar_first_follow(rng):
+    reglas = gramatica_aleatoria(rng)
+    variables, terminales = extraer_variables_terminales(reglas)
+    referencia = inicializar_gramatica(variables, terminales, "S")
+    parser.calcular_first(reglas, referencia)
+    parser.calcular_follow(reglas, referencia)
+    grammar = inicializar_gramatica(variables, terminales, "S")
+    conjuntos.calcular_first(reglas, grammar, EPSILON)
+    conjuntos.calcular_follow(reglas, grammar, EPSILON)
+    if conjuntos_por_simbolo(grammar) != conjuntos_por_simbolo(referencia):
+        return reglas
+    return None
+
+
+def comprobar_mutable(rng, cambios=20):
+    """
+    Aplica cambios aleatorios (altas, bajas o ambas a la vez) y compara FIRST, FOLLOW y la
+    tabla con un análisis completo después de cada uno. S conserva siempre alguna regla.
+    """
+    reglas = gramatica_aleatoria(rng)
+    variables = VARIABLES[:rng.randint(1, len(VARIABLES))]
+    mutable = GramaticaMutable(reglas, inicio="S")
+    historial = [("inicial", reglas)]
+    for _ in range(cambios):
+        actuales = mutable.reglas()
+        agregar = [regla_aleatoria(rng, variables) for _ in range(rng.randint(0, 2))]
+        quitar = rng.sample(actuales, rng.randint(0, min(2, len(actuales))))
+        if sum(izq == "S" for izq, _ in actuales) == sum(izq == "S" for izq, _ in quitar):
+            quitar = [r for r in quitar if r[0] != "S"]
+        mutable.modificar(agregar=agregar, quitar=quitar)
+        historial.append(("agregar", agregar, "quitar", quitar))
+
+        actuales = sorted(mutable.reglas(), key=lambda r: r[0] != "S")
+        grammar, tabla, _, _ = preparar_gramatica(actuales)
+        if (conjuntos_por_simbolo(mutable.gramatica()) != conjuntos_por_simbolo(grammar)
+                or mutable.tabla != tabla):
+            return historial
+    return None
+
+
+COMPROBACIONES = {
+    "first_follow": comprobar_first_follow,
+    "mutable": comprobar_mutable,
+}
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description="Equivalencia con los algoritmos de referencia")
+    argumentos.add_argument("--casos", type=int, default=2000)
+    argumentos.add_argument("--semilla", type=int, default=0)
+    argumentos.add_argument("--solo", choices=sorted(COMPROBACIONES))
+    args = argumentos.parse_args()
+
+    fallos = 0
+    for nombre, comprobar in COMPROBACIONES.items():
+        if args.solo and nombre != args.solo:
+            continue
+        rng = random.Random(args.semilla)
+        for caso in range(args.casos):
+            diferencia = comprobar(rng)
+            if diferencia is not None:
+                print(f"{nombre}: diferencia en el caso {caso}: {diferencia}")
+                fallos += 1
+                break
+        else:
+            print(f"{nombre}: {args.casos} casos iguales")
+    sys.exit(1 if fallos else 0)
+
+
+if __name__ == "__main__":
+    main()
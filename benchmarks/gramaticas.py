@@ -0,0 +1,101 @@
+# benchmarks/gramaticas.py
+# Generador de gramáticas LL(1) sintéticas y de cadenas válidas e inválidas para ellas.
+#
+# La gramática generada combina:
+#   - `niveles` niveles de precedencia de expresiones (E0 -> E1 E0', E0' -> op0 E1 E0' | ε, ...)
+#   - `no_terminales` sentencias N0..Nk, cada una con `producciones` alternativas que empiezan
+#     por una palabra clave propia y terminan en un terminal de cierre
+#   - una cadena de `anulables` listas opcionales Z1..Zn (Zi -> zi Zi | ε) antes de cada cierre
+# Las sentencias solo usan sentencias de índice mayor, así que la gramática es LL(1) por
+# construcción y las derivaciones aleatorias terminan.
+# Se importa desde benchmarks/ejecutar.py, que añade la raíz del repositorio a sys.path.
+import random
+
+from parser import EPSILON
+
+
+def generar_gramatica(no_terminales=10, producciones=3, anulables=2, niveles=3, semilla=0):
+    rng = random.Random(semilla)
+    reglas = [("S", ["N0", "S"]), ("S", [EPSILON])]
+
+    for i in range(niveles):
+        e, resto = f"E{i}", f"E{i}'"
+        siguiente = f"E{i + 1}" if i + 1 < niveles else "F"
+        reglas.append((e, [siguiente, resto]))
+        reglas.append((resto, [f"op{i}", siguiente, resto]))
+        reglas.append((resto, [EPSILON]))
+    reglas.append(("F", ["(", "E0", ")"]))
+    reglas.append(("F", ["id"]))
+    reglas.append(("F", ["num"]))
+
+    cadena_anulable = [f"Z{j}" for j in range(anulables)]
+    for j in range(anulables):
+        reglas.append((f"Z{j}", [f"z{j}", f"Z{j}"]))
+        reglas.append((f"Z{j}", [EPSILON]))
+
+    for i in range(no_terminales):
+        for j in range(producciones):
+            cuerpo = [f"kw{i}_{j}"]
+            for _ in range(rng.randint(0, 3)):
+                if i + 1 < no_terminales and rng.random() < 0.4:
+                    cuerpo.append(f"N{rng.randint(i + 1, no_terminales - 1)}")
+                else:
+                    cuerpo += ["E0", ";"]
+            cuerpo += cadena_anulable
+            cuerpo.append(f"end{i}")
+            reglas.append((f"N{i}", cuerpo))
+    return reglas
+
+
+def texto_gramatica(reglas):
+    return "\n".join(f"{izq} -> {' '.join(der)}" for izq, der in reglas)
+
+
+def generar_cadena(reglas, tokens, profundidad=6, semilla=0):
+    """
+    Deriva aleatoriamente desde el símbolo inicial hasta tener al menos `tokens` tokens.
+    A partir de `profundidad` niveles de anidamiento se eligen siempre las alternativas más
+    cortas para que la derivación termine.
+    """
+    rng = random.Random(semilla)
+    alternativas = {}
+    for izq, der in reglas:
+        alternativas.setdefault(izq, []).append([s for s in der if s != EPSILON])
+    # Alternativa de salida de cada no terminal: la que no vuelve a anidar expresiones
+    salida = {nt: min(alts, key=lambda d: (("E0" in d) + ("S" in d) + (nt in d), len(d)))
+              for nt, alts in alternativas.items()}
+
+    salida_tokens = []
+    pila = [("S", 0)]
+    while pila:
+        simbolo, nivel = pila.pop()
+        if simbolo not in alternativas:
+            salida_tokens.append(simbolo)
+            continue
+        if simbolo == "S":
+            der = alternativas["S"][0] if len(salida_tokens) < tokens else []
+        elif nivel >= profundidad:
+            der = salida[simbolo]
+        else:
+            der = rng.choice(alternativas[simbolo])
+        for s in reversed(der):
+            pila.append((s, nivel + 1 if s != "S" else 0))
+    return salida_tokens
+
+
+def mutar_cadena(tokens, terminales, semilla=0):
+    """
+    Devuelve una copia con un borrado, una inserción o un cambio de token en una posición
+    aleatoria; casi siempre produce una cadena inválida.
+    """
+    rng = random.Random(semilla)
+    tokens = list(tokens)
+    i = rng.randrange(len(tokens) + 1)
+    operacion = rng.choice(("borrar", "insertar", "cambiar")) if tokens else "insertar"
+    if operacion == "insertar" or i == len(tokens):
+        tokens.insert(i, rng.choice(terminales))
+    elif operacion == "borrar":
+        del tokens[i]
+    else:
+        tokens[i] = rng.choice(terminales)
+    return tokens
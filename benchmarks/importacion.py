@@ -0,0 +1,45 @@
+# benchmarks/importacion.py
+# Mide el tiempo de importación y la memoria (RSS máxima) de cada módulo en un intérprete nuevo.
+# Uso: python benchmarks/importacion.py [repeticiones]
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULOS = ["parser", "conjuntos", "tabla_compilada", "flujo", "presentacion"]
+
+SONDA = """
+import resource, sys, time
+t = time.perf_counter()
+import {modulo}
+t = time.perf_counter() - t
+print(t, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def medir(modulo, repeticiones):
+    tiempos = []
+    rss = 0
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, "-c", SONDA.format(modulo=modulo)],
+                                cwd=RAIZ, capture_output=True, text=True)
+        if salida.returncode != 0:
+            return None
+        t, memoria = salida.stdout.split()
+        tiempos.append(float(t))
+        rss = max(rss, int(memoria))
+    return min(tiempos), rss
+
+
+if __name__ == "__main__":
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    base = medir("sys", repeticiones)
+    print(f"{'Módulo':<18} {'Importación (ms)':>18} {'RSS extra (KiB)':>16}")
+    print("-" * 54)
+    for modulo in MODULOS:
+        resultado = medir(modulo, repeticiones)
+        if resultado is None:
+            print(f"{modulo:<18} {'no disponible':>18}")
+            continue
+        t, rss = resultado
+        print(f"{modulo:<18} {t * 1000:>18.2f} {rss - base[1]:>16}")
@@ -0,0 +1,189 @@
+# cache_gramatica.py
+# Caché en disco del análisis de una gramática (FIRST/FOLLOW, tabla LL(1) y tabla compilada).
+#
+# Formato de cada archivo:
+#   cabecera  struct '<4sII'  -> MAGIA, VERSION, longitud de los metadatos
+#   metadatos JSON (grammar, símbolos, producciones y celdas con conflicto)
+#   relleno hasta múltiplo de 4
+#   celdas    int32 nativos, no_terminales x terminales (se pueden mapear con mmap)
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from parser import ConflictoLL1, detectar_conflictos, preparar_gramatica
+from tabla_compilada import armar_compilada, compilar_tabla
+
+DIRECTORIO = ".cache_ll1"
+MAX_ARCHIVOS = 256
+MAGIA = b"LL1C"
+VERSION = 1
+CABECERA = struct.Struct("<4sII")
+
+
+def clave_gramatica(reglas):
+    h = hashlib.sha256(f"{VERSION}\x1d".encode())
+    for izq, der in reglas:
+        h.update(izq.encode())
+        h.update(b"\x1f")
+        h.update("\x1f".join(der).encode())
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def guardar_analisis(ruta, grammar, tabla, inicio, compilada):
+    producciones = compilada.producciones
+    id_produccion = {regla: i for i, regla in enumerate(producciones)}
+    num_t = len(compilada.terminales)
+
+    # La tabla compilada guarda una producción por celda; el resto se anota aparte
+    conflictos = []
+    for n, nt in enumerate(compilada.no_terminales):
+        for t, reglas_celda in tabla[nt].items():
+            if len(reglas_celda) > 1:
+                elegida = compilada.celdas[n * num_t + compilada.id_terminal[t]]
+                otras = sorted(id_produccion[r] for r in reglas_celda if id_produccion[r] != elegida)
+                conflictos.append([n, compilada.id_terminal[t], otras])
+
+    meta = json.dumps({
+        "orden": sys.byteorder,
+        "grammar": grammar,
+        "inicio": inicio,
+        "terminales": compilada.terminales,
+        "no_terminales": compilada.no_terminales,
+        "producciones": [[izq, list(der)] for izq, der in producciones],
+        "conflictos": conflictos,
+    }, ensure_ascii=False).encode()
+    relleno = -(CABECERA.size + len(meta)) % 4
+
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as f:
+        f.write(CABECERA.pack(MAGIA, VERSION, len(meta)))
+        f.write(meta)
+        f.write(b"\0" * relleno)
+        f.write(array("i", compilada.celdas).tobytes())
+    os.replace(temporal, ruta)
+
+
+def cargar_analisis_guardado(ruta, mapear=False, completa=True):
+    """
+    Lee un análisis guardado. Con mapear=True las celdas se mapean con mmap en lugar
+    de copiarse (la tabla resultante no se puede enviar a otros procesos).
+    Con completa=False la tabla en diccionario solo trae las celdas con conflicto (basta
+    para detectar_conflictos) y no se recorren las no_terminales x terminales celdas;
+    para analizar se usa la compilada.
+    Devuelve None si el archivo no existe o no es válido.
+    """
+    try:
+        with open(ruta, "rb") as f:
+            datos = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    # El mmap solo sigue abierto si las celdas lo usan (mapear=True y archivo válido)
+    mapeado = False
+    try:
+        magia, version, largo = CABECERA.unpack_from(datos)
+        if magia != MAGIA or version != VERSION:
+            return None
+        meta = json.loads(bytes(datos[CABECERA.size:CABECERA.size + largo]))
+        if meta["orden"] != sys.byteorder:
+            return None
+        terminales = meta["terminales"]
+        no_terminales = meta["no_terminales"]
+        producciones = [(izq, tuple(der)) for izq, der in meta["producciones"]]
+
+        inicio_celdas = CABECERA.size + largo
+        inicio_celdas += -inicio_celdas % 4
+        if len(datos) - inicio_celdas != 4 * len(terminales) * len(no_terminales):
+            return None
+
+        if mapear:
+            celdas = memoryview(datos)[inicio_celdas:].cast("i")
+            mapeado = True
+        else:
+            celdas = array("i")
+            celdas.frombytes(datos[inicio_celdas:])
+    except (struct.error, ValueError, KeyError):
+        return None
+    finally:
+        if not mapeado:
+            datos.close()
+
+    compilada = armar_compilada(terminales, no_terminales, producciones, celdas, meta["inicio"])
+    num_t = len(terminales)
+
+    tabla = {}
+    if completa:
+        for n, nt in enumerate(no_terminales):
+            fila = {}
+            for t in range(num_t):
+                prod = celdas[n * num_t + t]
+                fila[terminales[t]] = {producciones[prod]} if prod >= 0 else set()
+            tabla[nt] = fila
+    for n, t, otras in meta["conflictos"]:
+        celda = tabla.setdefault(no_terminales[n], {}).setdefault(terminales[t], set())
+        celda.add(producciones[celdas[n * num_t + t]])
+        celda.update(producciones[p] for p in otras)
+
+    return meta["grammar"], tabla, terminales[:-1], meta["inicio"], compilada
+
+
+def podar_cache(directorio=DIRECTORIO, max_archivos=MAX_ARCHIVOS):
+    """
+    Deja como mucho max_archivos análisis en el directorio, borrando los de uso más antiguo
+    (cargar_analisis actualiza la fecha de modificación de cada archivo que lee).
+    """
+    try:
+        with os.scandir(directorio) as entradas:
+            archivos = [(e.stat().st_mtime, e.path) for e in entradas if e.name.endswith(".ll1")]
+    except OSError:
+        return
+    if len(archivos) <= max_archivos:
+        return
+    archivos.sort()
+    for _, ruta in archivos[:len(archivos) - max_archivos]:
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass  # otro proceso ya lo borró
+
+
+def cargar_analisis(reglas, directorio=DIRECTORIO, mapear=False, estricto=False, estadisticas=None,
+                    max_archivos=MAX_ARCHIVOS, completa=True):
+    """
+    Devuelve (grammar, tabla, terminales, inicio, compilada) para las reglas, leyéndolo
+    de la caché si ya se calculó para exactamente las mismas reglas. Con completa=False,
+    al leer de la caché la tabla solo trae las celdas con conflicto (ver
+    cargar_analisis_guardado); quien solo analiza con la compilada se ahorra construirla.
+    Con estricto=True lanza ConflictoLL1 si la tabla tiene conflictos.
+    La caché guarda como mucho max_archivos gramáticas (se descartan las menos usadas);
+    con max_archivos=0 no se escribe nada nuevo.
+    """
+    ruta = os.path.join(directorio, clave_gramatica(reglas) + ".ll1")
+    guardado = cargar_analisis_guardado(ruta, mapear, completa)
+    if guardado is not None:
+        try:
+            os.utime(ruta)
+        except OSError:
+            pass
+        if estricto:
+            conflictos = detectar_conflictos(guardado[1], guardado[0])
+            if conflictos:
+                raise ConflictoLL1(conflictos)
+        return guardado
+
+    grammar, tabla, terminales, inicio = preparar_gramatica(reglas, estricto, estadisticas)
+    compilada = compilar_tabla(reglas, tabla, inicio)
+    if max_archivos > 0:
+        try:
+            guardar_analisis(ruta, grammar, tabla, inicio, compilada)
+        except OSError:
+            pass  # sin permisos de escritura la caché simplemente no se usa
+        else:
+            podar_cache(directorio, max_archivos)
+    return grammar, tabla, terminales, inicio, compilada
@@ -0,0 +1,75 @@
+# cargador.py
+# Lectura única de gramáticas en texto. Acepta las dos sintaxis del proyecto:
+#   E' -> + T E' | ε        (alternativas con '|', ε para la vacía)
+#   E' -> #                 (una producción por línea, '#' para la vacía, como grammar.txt)
+# Las líneas en blanco se ignoran. El lado izquierdo debe ser un no terminal (mayúsculas,
+# como en parser.es_variable).
+import sys
+
+from parser import EPSILON, es_variable
+
+VACIAS = {EPSILON, "#"}
+
+
+class ErrorGramatica(ValueError):
+    def __init__(self, linea, mensaje):
+        self.linea = linea
+        self.mensaje = mensaje
+        super().__init__(f"Línea {linea}: {mensaje}")
+
+    def __reduce__(self):
+        # Para que llegue intacta desde los procesos trabajadores
+        return type(self), (self.linea, self.mensaje)
+
+
+def leer_producciones(lineas):
+    """
+    Genera (izq, der) por cada alternativa, leyendo las líneas de una en una (sirve un archivo
+    abierto). Los nombres de símbolo se internan, así las reglas repetidas comparten cadenas
+    y las comparaciones entre símbolos son más baratas. Lanza ErrorGramatica con el número
+    de línea si una línea no tiene la forma 'A -> ...' con A no terminal.
+    """
+    intern = sys.intern
+    for numero, linea in enumerate(lineas, 1):
+        linea = linea.strip()
+        if not linea:
+            continue
+        izq, flecha, der = linea.partition("->")
+        if not flecha:
+            raise ErrorGramatica(numero, f"falta '->' en '{linea}'")
+        if "->" in der:
+            raise ErrorGramatica(numero, f"más de un '->' en '{linea}'")
+        izq = izq.split()
+        if len(izq) != 1 or not es_variable(izq[0]):
+            raise ErrorGramatica(numero, "el lado izquierdo debe ser un único no terminal")
+        izq = intern(izq[0])
+        for alternativa in der.split("|"):
+            simbolos = [intern(s) for s in alternativa.split() if s not in VACIAS]
+            if not simbolos:
+                if not alternativa.strip():
+                    raise ErrorGramatica(numero, f"alternativa vacía en '{linea}' (usa ε)")
+                simbolos = [EPSILON]
+            yield izq, simbolos
+
+
+def cargar_reglas(lineas):
+    """
+    Lista de reglas (izq, der) sin producciones repetidas, en orden de primera aparición.
+    La vacía queda como [ε] sea cual sea la sintaxis de entrada. Una gramática sin reglas
+    también es un ErrorGramatica.
+    """
+    reglas = []
+    vistas = set()
+    for izq, der in leer_producciones(lineas):
+        clave = (izq, tuple(der))
+        if clave not in vistas:
+            vistas.add(clave)
+            reglas.append((izq, der))
+    if not reglas:
+        raise ErrorGramatica(1, "la gramática está vacía")
+    return reglas
+
+
+def cargar_archivo(ruta):
+    with open(ruta, "r", encoding="utf-8") as f:
+        return cargar_reglas(f)
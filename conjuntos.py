@@ -0,0 +1,190 @@
+# conjuntos.py
+# Cálculo de FIRST y FOLLOW por propagación sobre componentes fuertemente conexas.
+# Los conjuntos se guardan como enteros (un bit por terminal, '$' y ε) y al final se
+# vuelcan en las listas de `grammar`, con el mismo contenido que el cálculo por punto fijo.
+from collections import defaultdict
+
+
+def _simbolos(grammar, epsilon):
+    variables = [v for v in grammar if grammar[v]['tipo'] in ('V', 'I')]
+    terminales = sorted(t for t in grammar if grammar[t]['tipo'] == 'T')
+    nombres = terminales + ['$', epsilon]
+    bit = {s: 1 << i for i, s in enumerate(nombres)}
+    return variables, nombres, bit
+
+
+def _a_bits(lista, bit):
+    total = 0
+    for s in lista:
+        total |= bit[s]
+    return total
+
+
+def _volcar(lista, valor, nombres):
+    # Conserva el orden de lo que ya había y añade el resto en orden de bit. Solo se
+    # recorren los bits encendidos (b es el más bajo), no todo el ancho del entero.
+    presentes = set(lista)
+    while valor:
+        b = valor & -valor
+        nombre = nombres[b.bit_length() - 1]
+        if nombre not in presentes:
+            lista.append(nombre)
+        valor ^= b
+
+
+def componentes_fuertes(nodos, sucesores):
+    """
+    Genera las componentes fuertemente conexas (listas de nodos) con Tarjan iterativo.
+    Cada componente sale después de todas las componentes a las que apunta.
+    Los nodos sin entrada en `sucesores` no tienen sucesores.
+    """
+    indice = {}
+    bajo = {}
+    en_pila = set()
+    pila = []
+    contador = 0
+
+    for raiz in nodos:
+        if raiz in indice:
+            continue
+        indice[raiz] = bajo[raiz] = contador
+        contador += 1
+        pila.append(raiz)
+        en_pila.add(raiz)
+        trabajo = [(raiz, iter(sucesores.get(raiz, ())))]
+
+        while trabajo:
+            nodo, hijos = trabajo[-1]
+            for hijo in hijos:
+                if hijo not in indice:
+                    indice[hijo] = bajo[hijo] = contador
+                    contador += 1
+                    pila.append(hijo)
+                    en_pila.add(hijo)
+                    trabajo.append((hijo, iter(sucesores.get(hijo, ()))))
+                    break
+                if hijo in en_pila and indice[hijo] < bajo[nodo]:
+                    bajo[nodo] = indice[hijo]
+            else:
+                trabajo.pop()
+                if trabajo:
+                    padre = trabajo[-1][0]
+                    if bajo[nodo] < bajo[padre]:
+                        bajo[padre] = bajo[nodo]
+                if bajo[nodo] == indice[nodo]:
+                    componente = []
+                    while True:
+                        x = pila.pop()
+                        en_pila.discard(x)
+                        componente.append(x)
+                        if x == nodo:
+                            break
+                    yield componente
+
+
+def _propagar(base, sucesores):
+    """
+    Devuelve para cada nodo la unión de su base y la de todos los nodos alcanzables.
+    Cada componente fuertemente conexa se resuelve una sola vez, cuando ya están
+    resueltas todas las componentes a las que apunta.
+    """
+    valor = {}
+    for componente in componentes_fuertes(base, sucesores):
+        total = 0
+        for x in componente:
+            total |= base[x]
+            for y in sucesores[x]:
+                total |= valor.get(y, 0)
+        for x in componente:
+            valor[x] = total
+    return valor
+
+
+def calcular_anulables(reglas, epsilon='ε'):
+    """
+    No terminales que derivan ε. Cada producción cuenta cuántos símbolos le faltan por
+    ser anulables; los que no son lado izquierdo de ninguna regla nunca lo son.
+    """
+    izquierdos = {izq for izq, _ in reglas}
+    pendientes = []
+    apariciones = defaultdict(list)
+    anulables = set()
+    trabajo = []
+    for p, (izq, der) in enumerate(reglas):
+        cuenta = 0
+        for s in der:
+            if s == epsilon:
+                continue
+            cuenta += 1
+            if s not in izquierdos:
+                cuenta = -1
+                break
+            apariciones[s].append(p)
+        pendientes.append(cuenta)
+        if cuenta == 0 and izq not in anulables:
+            anulables.add(izq)
+            trabajo.append(izq)
+
+    while trabajo:
+        s = trabajo.pop()
+        for p in apariciones[s]:
+            pendientes[p] -= 1
+            izq = reglas[p][0]
+            if pendientes[p] == 0 and izq not in anulables:
+                anulables.add(izq)
+                trabajo.append(izq)
+    return anulables
+
+
+def calcular_first(reglas, grammar, epsilon='ε'):
+    variables, nombres, bit = _simbolos(grammar, epsilon)
+    bit_epsilon = bit[epsilon]
+    anulables = calcular_anulables(reglas, epsilon)
+
+    base = {v: _a_bits(grammar[v]['first'], bit) & ~bit_epsilon for v in variables}
+    sucesores = {v: set() for v in variables}
+    for izq, der in reglas:
+        for s in der:
+            if s == epsilon:
+                continue
+            if grammar[s]['tipo'] == 'T':
+                base[izq] |= bit[s]
+                break
+            sucesores[izq].add(s)
+            if s not in anulables:
+                break
+
+    valor = _propagar(base, sucesores)
+    for v in variables:
+        if v in anulables:
+            valor[v] |= bit_epsilon
+        _volcar(grammar[v]['first'], valor[v], nombres)
+
+
+def calcular_follow(reglas, grammar, epsilon='ε'):
+    variables, nombres, bit = _simbolos(grammar, epsilon)
+    bit_epsilon = bit[epsilon]
+    first = {s: _a_bits(grammar[s]['first'], bit) for s in grammar}
+
+    # FOLLOW(B) depende de FOLLOW(A) cuando B cierra (salvo anulables) una producción de A
+    base = {v: _a_bits(grammar[v]['follow'], bit) for v in variables}
+    sucesores = {v: set() for v in variables}
+    for izq, der in reglas:
+        der = [s for s in der if s != epsilon]
+        resto = 0
+        anulable = True
+        for s in reversed(der):
+            if grammar[s]['tipo'] != 'T':
+                base[s] |= resto
+                if anulable and s != izq:
+                    sucesores[s].add(izq)
+            f = first[s]
+            if f & bit_epsilon:
+                resto |= f & ~bit_epsilon
+            else:
+                resto = f
+                anulable = False
+
+    valor = _propagar(base, sucesores)
+    for v in variables:
+        _volcar(grammar[v]['follow'], valor[v], nombres)
@@ -0,0 +1,99 @@
+# flujo.py
+from tabla_compilada import ids_de_tokens, mensaje_desconocido, mensaje_error
+
+
+class ReconocedorFlujo:
+    """
+    Reconocedor LL(1) incremental sobre una tabla compilada.
+    Recibe los tokens de uno en uno y solo guarda la pila de predicción, así que la
+    memoria depende de la profundidad de la pila y no del tamaño de la entrada.
+    """
+
+    def __init__(self, compilada):
+        self.compilada = compilada
+        self.num_terminales = len(compilada.terminales)
+        self.fin = self.num_terminales - 1
+        self.pila = [self.fin, compilada.inicio]
+        self.posicion = 0
+        self.resultado = None
+
+    def alimentar(self, token):
+        """
+        Procesa un token por nombre. Devuelve None mientras la cadena siga siendo
+        un prefijo válido y (valida, posicion, mensaje) en cuanto hay decisión.
+        """
+        if self.resultado is not None:
+            return self.resultado
+        simbolo, = ids_de_tokens((token,), self.compilada)
+        if simbolo is None:
+            self.resultado = (False, self.posicion, mensaje_desconocido((token,), 0))
+            return self.resultado
+        return self.alimentar_id(simbolo)
+
+    def alimentar_id(self, simbolo):
+        if self.resultado is not None:
+            return self.resultado
+
+        compilada = self.compilada
+        num_t = self.num_terminales
+        celdas = compilada.celdas
+        pila = self.pila
+
+        while True:
+            tope = pila[-1]
+            if tope >= num_t:
+                prod = celdas[(tope - num_t) * num_t + simbolo]
+                if prod < 0:
+                    self.resultado = (False, self.posicion, mensaje_error(compilada, tope, simbolo))
+                    return self.resultado
+                pila.pop()
+                pila.extend(compilada.empujes[prod])
+            elif tope == simbolo:
+                if tope == self.fin:
+                    self.resultado = (True, None, None)
+                    return self.resultado
+                pila.pop()
+                self.posicion += 1
+                return None
+            else:
+                self.resultado = (False, self.posicion, mensaje_error(compilada, tope, simbolo))
+                return self.resultado
+
+    def finalizar(self):
+        """
+        Indica el fin de la entrada ('$') y devuelve el resultado definitivo.
+        """
+        return self.alimentar_id(self.fin)
+
+
+def tokens_de_archivo(archivo, tam_bloque=1 << 16):
+    """
+    Genera los tokens (separados por espacios) de un archivo abierto leyendo por bloques,
+    sin cargarlo entero aunque tenga líneas muy largas.
+    """
+    resto = ""
+    while True:
+        bloque = archivo.read(tam_bloque)
+        if not bloque:
+            break
+        partes = (resto + bloque).split()
+        # El último trozo puede ser un token cortado por el borde del bloque
+        if partes and not bloque[-1].isspace():
+            resto = partes.pop()
+        else:
+            resto = ""
+        yield from partes
+    if resto:
+        yield resto
+
+
+def reconocer_flujo(tokens, compilada):
+    """
+    Reconoce los tokens de cualquier iterable (por ejemplo tokens_de_archivo(f))
+    y se detiene en el primer error sin consumir el resto.
+    """
+    reconocedor = ReconocedorFlujo(compilada)
+    for token in tokens:
+        if reconocedor.alimentar(token) is not None:
+            return reconocedor.resultado
+    return reconocedor.finalizar()
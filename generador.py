@@ -0,0 +1,96 @@
+# generador.py
+import sys
+
+from cargador import cargar_archivo
+from parser import preparar_gramatica
+from tabla_compilada import compilar_tabla
+
+PLANTILLA = '''\
+# Parser LL(1) generado por generador.py. No modificar a mano.
+# Gramática:
+{gramatica}
+
+TERMINALES = {terminales!r}
+NO_TERMINALES = {no_terminales!r}
+PRODUCCIONES = {producciones!r}
+TOKENS = {{t: i for i, t in enumerate(TERMINALES[:-1])}}
+
+_NUM_T = {num_t}
+_FIN = {fin}
+_INICIO = {inicio}
+# _CELDAS[(simbolo - _NUM_T) * _NUM_T + token] -> id de producción o -1
+_CELDAS = {celdas!r}
+# Lado derecho invertido de cada producción, listo para apilar
+_EMPUJES = {empujes!r}
+
+
+def reconocer_ids(ids, tokens=None):
+    """
+    Reconoce un iterable de ids de token (ver TOKENS) y devuelve (valida, posicion, mensaje).
+    Un None es un token desconocido (`tokens` da su nombre). Mismo recorrido y mensajes
+    que tabla_compilada.reconocer_ids, copiado aquí para que el módulo no tenga dependencias.
+    """
+    celdas = _CELDAS
+    empujes = _EMPUJES
+    entrada = iter(ids)
+    simbolo = next(entrada, _FIN)
+    pila = [_FIN, _INICIO]
+    i = 0
+
+    while simbolo is not None:
+        tope = pila.pop()
+        if tope >= _NUM_T:
+            prod = celdas[(tope - _NUM_T) * _NUM_T + simbolo]
+            if prod < 0:
+                return False, i, f"Error: no hay regla para {{NO_TERMINALES[tope - _NUM_T]}} con '{{TERMINALES[simbolo]}}'"
+            pila.extend(empujes[prod])
+        elif tope == simbolo:
+            if tope == _FIN:
+                return True, None, None
+            i += 1
+            simbolo = next(entrada, _FIN)
+        elif tope == _FIN:
+            return False, i, "Error: símbolo desconocido en pila"
+        else:
+            return False, i, f"Error: se esperaba '{{TERMINALES[tope]}}' pero se encontró '{{TERMINALES[simbolo]}}'"
+    return False, i, f"Error: token desconocido '{{tokens[i] if tokens is not None else '?'}}'"
+
+
+def reconocer(cadena):
+    """
+    Reconoce una cadena de tokens separados por espacios ('$' no es un token: TOKENS no lo tiene).
+    """
+    tokens = cadena.split()
+    return reconocer_ids([TOKENS.get(t) for t in tokens], tokens)
+'''
+
+
+def generar_modulo(reglas, tabla, inicio):
+    """
+    Genera el código fuente de un módulo Python autónomo (sin dependencias) que reconoce
+    la gramática con la tabla dada, trabajando sobre ids enteros de token.
+    """
+    compilada = compilar_tabla(reglas, tabla, inicio)
+    gramatica = "\n".join(f"#   {izq} -> {' '.join(der)}" for izq, der in compilada.producciones)
+    return PLANTILLA.format(
+        gramatica=gramatica,
+        terminales=tuple(compilada.terminales),
+        no_terminales=tuple(compilada.no_terminales),
+        producciones=tuple(compilada.producciones),
+        num_t=len(compilada.terminales),
+        fin=len(compilada.terminales) - 1,
+        inicio=compilada.inicio,
+        celdas=tuple(compilada.celdas),
+        empujes=tuple(compilada.empujes),
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Uso: python generador.py gramatica.txt salida.py")
+        sys.exit(1)
+    reglas = cargar_archivo(sys.argv[1])
+    # Un parser generado no debe elegir en silencio entre producciones en conflicto
+    grammar, tabla, terminales, inicio = preparar_gramatica(reglas, estricto=True)
+    with open(sys.argv[2], "w") as f:
+        f.write(generar_modulo(reglas, tabla, inicio))
@@ -0,0 +1,221 @@
+# gramatica_mutable.py
+from collections import Counter, defaultdict
+
+from parser import EPSILON, es_variable
+
+
+class GramaticaMutable:
+    """
+    Gramática a la que se le pueden añadir y quitar producciones manteniendo al día
+    FIRST, FOLLOW y la tabla LL(1). Cada cambio solo recalcula los símbolos cuyo FIRST o
+    FOLLOW puede depender de él y reconstruye solo sus filas de la tabla; el resultado es
+    el mismo que el de preparar_gramatica sobre las reglas actuales.
+
+    Las producciones se guardan como tuplas y la tabla tiene el formato de
+    construir_tabla_ll1 (celdas con conjuntos de (izq, der)).
+    """
+
+    def __init__(self, reglas=(), inicio=None):
+        self.producciones = defaultdict(list)
+        self.ocurrencias = defaultdict(set)   # símbolo -> producciones en cuyo lado derecho aparece
+        self.usos_variable = Counter()
+        self.usos_terminal = Counter()
+        self.inicio = inicio
+        self.anulables = set()
+        self.first = {}
+        self.follow = {}
+        self.tabla = {}
+        self.modificar(agregar=reglas)
+
+    # Consulta
+    def reglas(self):
+        return [(izq, list(der)) for izq, ders in self.producciones.items() for der in ders]
+
+    @property
+    def terminales(self):
+        return sorted(self.usos_terminal)
+
+    def gramatica(self):
+        """
+        Devuelve el diccionario `grammar` con el mismo contenido que inicializar_gramatica
+        más calcular_first y calcular_follow.
+        """
+        grammar = {}
+        for v in sorted(self.first):
+            first = sorted(self.first[v]) + ([EPSILON] if v in self.anulables else [])
+            grammar[v] = {"tipo": "I" if v == self.inicio else "V",
+                          "first": first, "follow": sorted(self.follow[v])}
+        for t in self.terminales:
+            grammar[t] = {"tipo": "T", "first": [t]}
+        return grammar
+
+    # Modificación
+    def agregar(self, izq, der):
+        return self.modificar(agregar=[(izq, der)]) > 0
+
+    def quitar(self, izq, der):
+        return self.modificar(quitar=[(izq, der)]) > 0
+
+    def modificar(self, agregar=(), quitar=()):
+        """
+        Aplica varios cambios de una vez y actualiza el análisis una sola vez.
+        Devuelve cuántas producciones cambiaron de verdad.
+        """
+        cambiadas = []
+        for izq, der in quitar:
+            der = tuple(der) or (EPSILON,)
+            if der in self.producciones.get(izq, ()):
+                self.producciones[izq].remove(der)
+                if not self.producciones[izq]:
+                    del self.producciones[izq]
+                self._contar(izq, der, -1)
+                cambiadas.append((izq, der))
+        for izq, der in agregar:
+            der = tuple(der) or (EPSILON,)
+            if der not in self.producciones.get(izq, ()):
+                if self.inicio is None:
+                    self.inicio = izq
+                self.producciones[izq].append(der)
+                self._contar(izq, der, 1)
+                cambiadas.append((izq, der))
+        if cambiadas:
+            self._actualizar(cambiadas)
+        return len(cambiadas)
+
+    def _contar(self, izq, der, signo):
+        regla = (izq, der)
+        self._usar_variable(izq, signo)
+        for s in der:
+            if s == EPSILON:
+                continue
+            if signo > 0:
+                self.ocurrencias[s].add(regla)
+            else:
+                self.ocurrencias[s].discard(regla)
+                if not self.ocurrencias[s]:
+                    del self.ocurrencias[s]
+            if es_variable(s):
+                self._usar_variable(s, signo)
+            else:
+                self._usar_terminal(s, signo)
+
+    def _usar_variable(self, v, signo):
+        self.usos_variable[v] += signo
+        if self.usos_variable[v] == 0:
+            del self.usos_variable[v]
+            self.anulables.discard(v)
+            del self.first[v], self.follow[v], self.tabla[v]
+        elif v not in self.first:
+            self.first[v] = set()
+            self.follow[v] = {"$"} if v == self.inicio else set()
+            self.tabla[v] = {t: set() for t in self.usos_terminal}
+            self.tabla[v]["$"] = set()
+
+    def _usar_terminal(self, t, signo):
+        self.usos_terminal[t] += signo
+        if self.usos_terminal[t] == 0:
+            del self.usos_terminal[t]
+            for fila in self.tabla.values():
+                del fila[t]
+        elif self.usos_terminal[t] == 1 and signo > 0:
+            for fila in self.tabla.values():
+                fila[t] = set()
+
+    # Recálculo local
+    def _usuarios(self, simbolos):
+        """
+        Cierre de los no terminales que usan (directa o indirectamente) alguno de los símbolos.
+        """
+        vistos = set(s for s in simbolos if s in self.first)
+        pendientes = list(vistos)
+        while pendientes:
+            s = pendientes.pop()
+            for izq, _ in self.ocurrencias.get(s, ()):
+                if izq not in vistos:
+                    vistos.add(izq)
+                    pendientes.append(izq)
+        return vistos
+
+    def _first_secuencia(self, der):
+        first = set()
+        for s in der:
+            if s == EPSILON:
+                continue
+            if s not in self.first:
+                first.add(s)
+                return first, False
+            first |= self.first[s]
+            if s not in self.anulables:
+                return first, False
+        return first, True
+
+    def _actualizar(self, cambiadas):
+        # FIRST y anulables: el no terminal cambiado y todos los que dependen de él
+        afectados_first = self._usuarios([izq for izq, _ in cambiadas])
+        for v in afectados_first:
+            self.first[v] = set()
+            self.anulables.discard(v)
+        cambio = True
+        while cambio:
+            cambio = False
+            for v in afectados_first:
+                for der in self.producciones.get(v, ()):
+                    first, anulable = self._first_secuencia(der)
+                    if not first <= self.first[v]:
+                        self.first[v] |= first
+                        cambio = True
+                    if anulable and v not in self.anulables:
+                        self.anulables.add(v)
+                        cambio = True
+
+        # FOLLOW: los símbolos de las producciones cambiadas o de las que contienen un símbolo
+        # con FIRST recalculado, y lo que herede FOLLOW de ellos
+        semillas = set()
+        for _, der in cambiadas:
+            semillas.update(s for s in der if s in self.first)
+        for v in afectados_first:
+            for _, der in self.ocurrencias.get(v, ()):
+                semillas.update(s for s in der if s in self.first)
+        afectados_follow = set(semillas)
+        pendientes = list(semillas)
+        while pendientes:
+            izq = pendientes.pop()
+            for der in self.producciones.get(izq, ()):
+                for s in der:
+                    if s in self.first and s not in afectados_follow:
+                        afectados_follow.add(s)
+                        pendientes.append(s)
+
+        for v in afectados_follow:
+            self.follow[v] = {"$"} if v == self.inicio else set()
+        cambio = True
+        while cambio:
+            cambio = False
+            for v in afectados_follow:
+                for izq, der in self.ocurrencias.get(v, ()):
+                    for i, s in enumerate(der):
+                        if s != v:
+                            continue
+                        first, anulable = self._first_secuencia(der[i + 1:])
+                        if anulable:
+                            first = first | self.follow[izq]
+                        if not first <= self.follow[v]:
+                            self.follow[v] |= first
+                            cambio = True
+
+        # Filas de la tabla que pueden haber cambiado
+        for v in afectados_first | afectados_follow | {izq for izq, _ in cambiadas}:
+            if v in self.tabla:
+                self._reconstruir_fila(v)
+
+    def _reconstruir_fila(self, v):
+        fila = self.tabla[v]
+        for celda in fila.values():
+            celda.clear()
+        for der in self.producciones.get(v, ()):
+            first, anulable = self._first_secuencia(der)
+            for t in first:
+                fila[t].add((v, der))
+            if anulable:
+                for t in self.follow[v]:
+                    fila[t].add((v, der))
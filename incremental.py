@@ -0,0 +1,96 @@
+# incremental.py
+from tabla_compilada import mensaje_error
+
+
+class AnalizadorIncremental:
+    """
+    Reconocedor LL(1) sobre una tabla compilada que permite volver a validar un documento
+    tras editar unos pocos tokens sin recorrerlo entero.
+
+    Durante el análisis se guarda una copia de la pila cada `intervalo` tokens (puntos de
+    control). Al editar, se reanuda desde el último punto anterior a la edición y, una vez
+    pasada la zona editada, se compara la pila con los puntos del análisis previo: si
+    coincide, el resto del documento se comporta igual que antes y se reutiliza su resultado.
+    Los tokens son ids de terminal (por ejemplo los de lexico.Lexico.tokens).
+    """
+
+    def __init__(self, compilada, intervalo=128):
+        self.compilada = compilada
+        self.intervalo = intervalo
+        self.tokens = []
+        self.puntos = {}
+        self.resultado = None
+        self.reanalizados = 0
+
+    def analizar(self, ids):
+        self.tokens = list(ids)
+        pila = [len(self.compilada.terminales) - 1, self.compilada.inicio]
+        self.puntos = {0: tuple(pila)}
+        self.resultado, _ = self._ejecutar(0, pila, {}, 0, 0)
+        return self.resultado
+
+    def editar(self, inicio, fin, nuevos):
+        """
+        Sustituye tokens[inicio:fin] por los ids `nuevos` y devuelve el nuevo resultado.
+        """
+        nuevos = list(nuevos)
+        delta = len(nuevos) - (fin - inicio)
+        self.tokens[inicio:fin] = nuevos
+
+        desde = max(p for p in self.puntos if p <= inicio)
+        viejos = {p: pila for p, pila in self.puntos.items() if p >= fin}
+        self.puntos = {p: pila for p, pila in self.puntos.items() if p <= desde}
+
+        resultado, convergencia = self._ejecutar(desde, list(self.puntos[desde]), viejos,
+                                                 inicio + len(nuevos), delta)
+        if convergencia is not None:
+            # El resto coincide con el análisis anterior: se desplazan sus puntos y su resultado
+            for p, pila in viejos.items():
+                if p >= convergencia - delta:
+                    self.puntos[p + delta] = pila
+            valida, posicion, mensaje = self.resultado
+            resultado = (valida, posicion + delta if posicion is not None else None, mensaje)
+        self.resultado = resultado
+        return resultado
+
+    def _ejecutar(self, j, pila, viejos, limite, delta):
+        """
+        Analiza desde el token j con la pila dada. Devuelve (resultado, convergencia), donde
+        convergencia es la posición en la que la pila coincidió con un punto viejo o None.
+        """
+        compilada = self.compilada
+        num_t = len(compilada.terminales)
+        fin = num_t - 1
+        celdas = compilada.celdas
+        empujes = compilada.empujes
+        tokens = self.tokens
+        n = len(tokens)
+        intervalo = self.intervalo
+        puntos = self.puntos
+        comienzo = j
+
+        simbolo = tokens[j] if j < n else fin
+        while True:
+            tope = pila[-1]
+            if tope >= num_t:
+                prod = celdas[(tope - num_t) * num_t + simbolo]
+                if prod < 0:
+                    self.reanalizados = j - comienzo
+                    return (False, j, mensaje_error(compilada, tope, simbolo)), None
+                pila.pop()
+                pila.extend(empujes[prod])
+            elif tope == simbolo:
+                if tope == fin:
+                    self.reanalizados = j - comienzo
+                    return (True, None, None), None
+                pila.pop()
+                j += 1
+                simbolo = tokens[j] if j < n else fin
+                if j % intervalo == 0:
+                    puntos[j] = tuple(pila)
+                if j >= limite and (j - delta) in viejos and viejos[j - delta] == tuple(pila):
+                    self.reanalizados = j - comienzo
+                    return None, j
+            else:
+                self.reanalizados = j - comienzo
+                return (False, j, mensaje_error(compilada, tope, simbolo)), None
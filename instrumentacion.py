@@ -0,0 +1,149 @@
+# instrumentacion.py
+# Contadores opcionales para el reconocedor compilado y tiempos por fase de la preparación.
+# Los reconocedores normales no los usan; solo cuando se les pasa `estadisticas` se cambia
+# a la variante instrumentada de este módulo.
+import json
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from tabla_compilada import mensaje_desconocido, mensaje_error
+
+
+class Estadisticas:
+    """
+    Acumula, entre todas las cadenas analizadas con ella:
+    pasos del autómata, expansiones por producción, coincidencias de terminales,
+    profundidad máxima de la pila, cadenas y errores, y segundos por fase
+    ('lectura', 'first', 'follow', 'tabla', 'analisis', ...).
+
+    Los observadores son funciones observador(evento, posicion, detalle) que reciben
+    'expansion' (id de producción), 'coincidencia' (id de terminal), 'error' (mensaje),
+    'fin' (valida) y 'fase' ((nombre, segundos)). Sin observadores no se emite nada.
+    """
+
+    def __init__(self, compilada=None, observador=None):
+        self.compilada = compilada
+        self.pasos = 0
+        self.expansiones = Counter()
+        self.coincidencias = 0
+        self.profundidad_maxima = 0
+        self.cadenas = 0
+        self.errores = 0
+        self.tiempos = defaultdict(float)
+        self.observadores = [observador] if observador else []
+
+    def observar(self, observador):
+        self.observadores.append(observador)
+        return observador
+
+    def emitir(self, evento, posicion, detalle):
+        for observador in self.observadores:
+            observador(evento, posicion, detalle)
+
+    @contextmanager
+    def fase(self, nombre):
+        comienzo = time.perf_counter()
+        try:
+            yield self
+        finally:
+            segundos = time.perf_counter() - comienzo
+            self.tiempos[nombre] += segundos
+            if self.observadores:
+                self.emitir("fase", None, (nombre, segundos))
+
+    def produccion(self, prod):
+        if self.compilada is None:
+            return str(prod)
+        izq, der = self.compilada.producciones[prod]
+        return f"{izq} -> {' '.join(der)}"
+
+    def calientes(self, n=10):
+        """
+        Las n producciones más expandidas como (texto, veces).
+        """
+        return [(self.produccion(p), veces) for p, veces in self.expansiones.most_common(n)]
+
+    def a_dict(self):
+        return {
+            "cadenas": self.cadenas,
+            "errores": self.errores,
+            "pasos": self.pasos,
+            "coincidencias": self.coincidencias,
+            "expansiones": sum(self.expansiones.values()),
+            "profundidad_maxima": self.profundidad_maxima,
+            "por_produccion": {self.produccion(p): v for p, v in self.expansiones.most_common()},
+            "tiempos": dict(self.tiempos),
+        }
+
+    def a_json(self, **opciones):
+        return json.dumps(self.a_dict(), ensure_ascii=False, **opciones)
+
+
+def reconocer_ids_instrumentado(ids, compilada, estadisticas, tokens=None, derivacion=None):
+    """
+    Mismo recorrido, resultado y argumentos que tabla_compilada.reconocer_ids (tokens
+    desconocidos como None, `derivacion` opcional), contando en `estadisticas`.
+    """
+    if estadisticas.compilada is None:
+        estadisticas.compilada = compilada
+    num_t = len(compilada.terminales)
+    fin = num_t - 1
+    celdas = compilada.celdas
+    empujes = compilada.empujes
+    emitir = estadisticas.emitir if estadisticas.observadores else None
+    expansiones = [0] * len(compilada.producciones)
+    aplicar = derivacion.append if derivacion is not None else None
+    pasos = coincidencias = 0
+    profundidad = 2
+
+    def terminar(resultado):
+        estadisticas.pasos += pasos
+        estadisticas.coincidencias += coincidencias
+        estadisticas.cadenas += 1
+        if not resultado[0]:
+            estadisticas.errores += 1
+        if profundidad > estadisticas.profundidad_maxima:
+            estadisticas.profundidad_maxima = profundidad
+        for prod, veces in enumerate(expansiones):
+            if veces:
+                estadisticas.expansiones[prod] += veces
+        if emitir:
+            if not resultado[0]:
+                emitir("error", resultado[1], resultado[2])
+            emitir("fin", i, resultado[0])
+        return resultado
+
+    with estadisticas.fase("analisis"):
+        entrada = iter(ids)
+        simbolo = next(entrada, fin)
+        pila = [fin, compilada.inicio]
+        i = 0
+
+        while True:
+            if simbolo is None:
+                return terminar((False, i, mensaje_desconocido(tokens, i)))
+            pasos += 1
+            tope = pila.pop()
+            if tope >= num_t:
+                prod = celdas[(tope - num_t) * num_t + simbolo]
+                if prod < 0:
+                    return terminar((False, i, mensaje_error(compilada, tope, simbolo)))
+                expansiones[prod] += 1
+                if aplicar is not None:
+                    aplicar(prod)
+                pila.extend(empujes[prod])
+                if len(pila) > profundidad:
+                    profundidad = len(pila)
+                if emitir:
+                    emitir("expansion", i, prod)
+            elif tope == simbolo:
+                if tope == fin:
+                    return terminar((True, None, None))
+                coincidencias += 1
+                if emitir:
+                    emitir("coincidencia", i, tope)
+                i += 1
+                simbolo = next(entrada, fin)
+            else:
+                return terminar((False, i, mensaje_error(compilada, tope, simbolo)))
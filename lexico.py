@@ -0,0 +1,121 @@
+# lexico.py
+import re
+
+from tabla_compilada import reconocer_ids
+
+# Patrones por defecto para los terminales que suelen representar clases de lexemas
+PATRONES = {
+    "id": r"[A-Za-z_][A-Za-z0-9_]*",
+    "num": r"[0-9]+(?:\.[0-9]+)?",
+}
+
+
+class ErrorLexico(ValueError):
+    def __init__(self, texto, posicion):
+        self.posicion = posicion
+        fragmento = texto[posicion:posicion + 10]
+        super().__init__(f"Error léxico en el carácter {posicion}: '{fragmento}'")
+
+
+class Lexico:
+    """
+    Analizador léxico para los terminales de una gramática, compilado a una única
+    expresión regular. Cada terminal se reconoce por su texto literal salvo los que tengan
+    patrón (por defecto 'id' y 'num' si existen). Los literales con forma de palabra que
+    también encajan en un patrón (palabras clave como 'if') se resuelven después del patrón,
+    así 'iffy' sigue siendo un identificador. Los patrones no deben usar grupos con nombre.
+    """
+
+    def __init__(self, terminales, patrones=None):
+        self.terminales = list(terminales)
+        ids = {t: i for i, t in enumerate(self.terminales)}
+        if patrones is None:
+            patrones = {t: p for t, p in PATRONES.items() if t in ids}
+        con_patron = [(t, re.compile(p)) for t, p in patrones.items() if t in ids]
+
+        self.palabras_clave = {}
+        literales = []
+        for t in self.terminales:
+            if t in patrones:
+                continue
+            if any(r.fullmatch(t) for _, r in con_patron):
+                self.palabras_clave[t] = ids[t]
+            else:
+                literales.append(t)
+
+        # Literales primero, de más largo a más corto ('==' antes que '='), luego los patrones
+        alternativas = [(f"l{ids[t]}", re.escape(t)) for t in sorted(literales, key=len, reverse=True)]
+        alternativas += [(f"p{ids[t]}", r.pattern) for t, r in con_patron]
+        alternativas.append(("espacio", r"\s+"))
+        self.regex = re.compile("|".join(f"(?P<{nombre}>{p})" for nombre, p in alternativas))
+        self.grupos = {nombre: int(nombre[1:]) for nombre, _ in alternativas if nombre != "espacio"}
+        self.grupos_patron = {nombre for nombre, _ in alternativas if nombre.startswith("p")}
+
+    def lexemas(self, texto):
+        """
+        Genera (id, lexema, posicion) perezosamente. Lanza ErrorLexico ante un carácter
+        que no empieza ningún token.
+        """
+        grupos = self.grupos
+        grupos_patron = self.grupos_patron
+        palabras_clave = self.palabras_clave
+        posicion = 0
+        # finditer salta lo que no encaja; un hueco entre coincidencias es un error léxico
+        for m in self.regex.finditer(texto):
+            inicio = m.start()
+            if inicio != posicion:
+                raise ErrorLexico(texto, posicion)
+            posicion = m.end()
+            nombre = m.lastgroup
+            if nombre != "espacio":
+                lexema = m.group()
+                id_token = grupos[nombre]
+                if nombre in grupos_patron:
+                    id_token = palabras_clave.get(lexema, id_token)
+                yield id_token, lexema, inicio
+        if posicion != len(texto):
+            raise ErrorLexico(texto, posicion)
+
+    def tokens(self, texto):
+        """
+        Genera solo los ids de token, listos para reconocer_ids. Es el mismo recorrido que
+        lexemas, pero solo extrae el lexema cuando hace falta mirar las palabras clave.
+        """
+        grupos = self.grupos
+        grupos_patron = self.grupos_patron
+        palabras_clave = self.palabras_clave
+        posicion = 0
+        for m in self.regex.finditer(texto):
+            if m.start() != posicion:
+                raise ErrorLexico(texto, posicion)
+            posicion = m.end()
+            nombre = m.lastgroup
+            if nombre == "espacio":
+                continue
+            if nombre in grupos_patron and palabras_clave:
+                yield palabras_clave.get(m.group(), grupos[nombre])
+            else:
+                yield grupos[nombre]
+        if posicion != len(texto):
+            raise ErrorLexico(texto, posicion)
+
+
+def lexico_para(compilada, patrones=None):
+    """
+    Léxico cuyos ids coinciden con los de la tabla compilada.
+    """
+    return Lexico(compilada.terminales[:-1], patrones)
+
+
+def reconocer_texto(texto, compilada, lexico=None):
+    """
+    Reconoce texto fuente sin separar, tokenizándolo sobre la marcha.
+    Un error léxico se informa como (False, posicion del token, mensaje).
+    """
+    lexico = lexico or lexico_para(compilada)
+    try:
+        return reconocer_ids(lexico.tokens(texto), compilada)
+    except ErrorLexico as e:
+        # Solo en el caso de error se cuentan los tokens anteriores al carácter inválido
+        leidos = sum(1 for _ in lexico.tokens(texto[:e.posicion]))
+        return False, leidos, f"Error: {e}"
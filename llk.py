@@ -0,0 +1,229 @@
+# llk.py
+# Tablas predictivas LL(k) (LL(k) fuerte: la decisión depende solo del no terminal y de los
+# k tokens siguientes). Las cadenas de anticipación son tuplas de como mucho k terminales;
+# las más cortas terminan siempre en '$'. La tabla se guarda como un trie por no terminal,
+# así que solo ocupa las anticipaciones que realmente aparecen.
+from collections import defaultdict, namedtuple
+
+from parser import EPSILON, extraer_variables_terminales
+
+TablaLLk = namedtuple("TablaLLk", [
+    "k",
+    "inicio",
+    "producciones",  # (izq, der) para cada id de producción
+    "arboles",       # no terminal -> trie: dict token -> subárbol, o id de producción en las hojas
+    "conflictos",    # (no terminal, anticipación, producciones) donde se eligió la menor
+])
+
+
+class ConflictoLLk(ValueError):
+    def __init__(self, k, conflictos):
+        self.k = k
+        self.conflictos = conflictos
+        detalle = "; ".join(
+            f"[{nt}, {' '.join(anticipacion)}]: " + " / ".join(f"{izq} → {' '.join(der)}" for izq, der in prods)
+            for nt, anticipacion, prods in conflictos
+        )
+        super().__init__(f"La gramática no es LL({k}): {detalle}")
+
+
+def _concatenar(prefijos, sufijos, k):
+    """
+    {(p + s)[:k]}: las cadenas ya completas (k símbolos) no se combinan.
+    """
+    resultado = set()
+    recortados = {}
+    for p in prefijos:
+        falta = k - len(p)
+        if falta <= 0 or (p and p[-1] == "$"):
+            resultado.add(p)
+            continue
+        if falta not in recortados:
+            recortados[falta] = {s[:falta] for s in sufijos}
+        for s in recortados[falta]:
+            resultado.add(p + s)
+    return resultado
+
+
+def _first_secuencia(der, first, variables, k):
+    cadenas = {()}
+    for s in der:
+        if s == EPSILON:
+            continue
+        siguiente = first[s] if s in variables else {(s,)}
+        cadenas = _concatenar(cadenas, siguiente, k)
+        if not cadenas or all(len(c) >= k for c in cadenas):
+            break
+    return cadenas
+
+
+def calcular_first_k(reglas, k):
+    """
+    FIRST_k de cada no terminal como conjunto de tuplas (la tupla vacía representa ε).
+    Se recalcula solo lo que depende de un no terminal cuyo conjunto creció.
+    """
+    variables = set(extraer_variables_terminales(reglas)[0])
+    first = {v: set() for v in variables}
+    usos = defaultdict(set)
+    for p, (_, der) in enumerate(reglas):
+        for s in der:
+            if s in variables:
+                usos[s].add(p)
+
+    pendientes = list(range(len(reglas)))
+    en_cola = set(pendientes)
+    while pendientes:
+        p = pendientes.pop()
+        en_cola.discard(p)
+        izq, der = reglas[p]
+        nuevas = _first_secuencia(der, first, variables, k) - first[izq]
+        if nuevas:
+            first[izq] |= nuevas
+            for q in usos[izq]:
+                if q not in en_cola:
+                    en_cola.add(q)
+                    pendientes.append(q)
+    return first
+
+
+def calcular_follow_k(reglas, first, k, inicio=None):
+    """
+    FOLLOW_k de cada no terminal. Cada cambio solo propaga las cadenas nuevas (la
+    concatenación distribuye sobre la unión).
+    """
+    variables = set(first)
+    inicio = inicio or reglas[0][0]
+    follow = {v: set() for v in variables}
+    # Para cada no terminal A: (B, FIRST_k de lo que sigue a B) por cada aparición en A -> α B β
+    colas = defaultdict(list)
+    for izq, der in reglas:
+        der = [s for s in der if s != EPSILON]
+        for i, s in enumerate(der):
+            if s in variables:
+                colas[izq].append((s, _first_secuencia(der[i + 1:], first, variables, k)))
+
+    # Como en calcular_follow, lo que aporta FIRST_k(β) por sí solo (cadenas ya completas)
+    # cuenta aunque A no sea alcanzable
+    nuevas = defaultdict(set)
+    nuevas[inicio].add(("$",))
+    for apariciones in colas.values():
+        for b, cola in apariciones:
+            nuevas[b].update(c for c in cola if len(c) >= k)
+    for b, cadenas in nuevas.items():
+        follow[b] |= cadenas
+    nuevas = {b: cadenas for b, cadenas in nuevas.items() if cadenas}
+    while nuevas:
+        izq, delta = nuevas.popitem()
+        for b, cola in colas[izq]:
+            agregadas = _concatenar(cola, delta, k) - follow[b]
+            if agregadas:
+                follow[b] |= agregadas
+                nuevas.setdefault(b, set()).update(agregadas)
+    return follow
+
+
+def _comprimir(nodo):
+    """
+    Sustituye cada subárbol con una sola producción por su id; así el reconocedor deja de
+    leer tokens en cuanto la decisión es única.
+    """
+    if isinstance(nodo, int):
+        return nodo
+    hijos = {t: _comprimir(h) for t, h in nodo.items()}
+    valores = set(hijos.values()) if all(isinstance(h, int) for h in hijos.values()) else None
+    if valores is not None and len(valores) == 1:
+        return valores.pop()
+    return hijos
+
+
+def construir_tabla_llk(reglas, k=2, estricto=False):
+    """
+    Tabla LL(k) fuerte: la producción A -> α se predice con FIRST_k(α FOLLOW_k(A)).
+    Con conflictos se elige la producción de menor id (como min() en LL(1)); con
+    estricto=True se lanza ConflictoLLk.
+    """
+    first = calcular_first_k(reglas, k)
+    follow = calcular_follow_k(reglas, first, k)
+    variables = set(first)
+
+    producciones = []
+    id_produccion = {}
+    for izq, der in reglas:
+        regla = (izq, tuple(der))
+        if regla not in id_produccion:
+            id_produccion[regla] = len(producciones)
+            producciones.append(regla)
+
+    hojas = defaultdict(dict)   # nt -> anticipación -> ids de producción
+    for p, (izq, der) in enumerate(producciones):
+        anticipaciones = _concatenar(_first_secuencia(der, first, variables, k), follow[izq], k)
+        for a in anticipaciones:
+            hojas[izq].setdefault(a, set()).add(p)
+
+    arboles = {}
+    conflictos = []
+    for nt in sorted(variables):
+        raiz = {}
+        for anticipacion, ids in hojas[nt].items():
+            if len(ids) > 1:
+                conflictos.append((nt, anticipacion, sorted(producciones[p] for p in ids)))
+            nodo = raiz
+            for t in anticipacion[:-1]:
+                nodo = nodo.setdefault(t, {})
+            nodo[anticipacion[-1]] = min(ids, key=producciones.__getitem__)
+        arboles[nt] = _comprimir(raiz)
+
+    if estricto and conflictos:
+        raise ConflictoLLk(k, conflictos)
+    return TablaLLk(k, reglas[0][0], producciones, arboles, conflictos)
+
+
+def k_minimo(reglas, max_k=3):
+    """
+    Menor k <= max_k para el que la gramática no tiene conflictos, o None.
+    """
+    for k in range(1, max_k + 1):
+        if not construir_tabla_llk(reglas, k).conflictos:
+            return k
+    return None
+
+
+def reconocer_llk(cadena, tabla):
+    """
+    Reconoce una cadena de tokens separados por espacios con la tabla LL(k). En cada
+    expansión se leen solo los tokens de anticipación necesarios para decidir, así que
+    a veces el error aparece después, al emparejar un terminal, pero en el mismo token.
+    Devuelve (valida, posicion, mensaje) como reconocer_cadena.
+    """
+    tokens = cadena.split()
+    n = len(tokens)
+    arboles = tabla.arboles
+    producciones = tabla.producciones
+    pila = ["$", tabla.inicio]
+    i = 0
+
+    while True:
+        tope = pila.pop()
+        simbolo = tokens[i] if i < n else "$"
+        if tope in arboles:
+            nodo = arboles[tope]
+            j = i
+            while not isinstance(nodo, int):
+                leido = tokens[j] if j < n else "$"
+                nodo = nodo.get(leido)
+                if nodo is None:
+                    anticipacion = ' '.join(tokens[i:j + 1] + ["$"] * (j + 1 - max(n, i)))
+                    return False, i, f"Error: no hay regla para {tope} con '{anticipacion}'"
+                j += 1
+            der = producciones[nodo][1]
+            if der != (EPSILON,):
+                pila.extend(reversed(der))
+        elif tope == "$":
+            # Solo el fin real de la entrada cierra la cadena; un '$' escrito no
+            if i == n:
+                return True, None, None
+            return False, i, "Error: símbolo desconocido en pila"
+        elif tope == simbolo:
+            i += 1
+        else:
+            return False, i, f"Error: se esperaba '{tope}' pero se encontró '{simbolo}'"
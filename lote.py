@@ -0,0 +1,85 @@
+# lote.py
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from instrumentacion import Estadisticas
+from cargador import cargar_archivo
+from parser import preparar_gramatica
+from tabla_compilada import compilar_tabla, reconocer_compilado
+
+# Tabla compilada de cada proceso trabajador; se recibe una sola vez en el inicializador
+_compilada = None
+
+
+def _inicializar_trabajador(compilada):
+    global _compilada
+    _compilada = compilada
+
+
+def _reconocer_bloque(cadenas):
+    return [reconocer_compilado(c, _compilada) for c in cadenas]
+
+
+def compilar_gramatica(reglas, estadisticas=None):
+    grammar, tabla, terminales, inicio = preparar_gramatica(reglas, estadisticas=estadisticas)
+    return compilar_tabla(reglas, tabla, inicio)
+
+
+def analizar_lote(cadenas, compilada, procesos=None, tam_bloque=None, estadisticas=None):
+    """
+    Reconoce muchas cadenas con la misma tabla compilada repartiéndolas entre procesos.
+    Devuelve una lista de (valida, posicion, mensaje) en el mismo orden que las cadenas.
+    Con `estadisticas` todo se analiza en este proceso para poder acumular los contadores.
+    """
+    cadenas = list(cadenas)
+    if estadisticas is not None:
+        return [reconocer_compilado(c, compilada, estadisticas) for c in cadenas]
+    procesos = procesos or os.cpu_count() or 1
+    if tam_bloque is None:
+        # Varios bloques por proceso para equilibrar entradas de distinta longitud
+        tam_bloque = max(1, len(cadenas) // (procesos * 8))
+
+    if procesos == 1 or len(cadenas) <= tam_bloque:
+        return [reconocer_compilado(c, compilada) for c in cadenas]
+
+    bloques = [cadenas[i:i + tam_bloque] for i in range(0, len(cadenas), tam_bloque)]
+    resultados = []
+    with ProcessPoolExecutor(procesos, initializer=_inicializar_trabajador,
+                             initargs=(compilada,)) as ejecutor:
+        for parcial in ejecutor.map(_reconocer_bloque, bloques):
+            resultados.extend(parcial)
+    return resultados
+
+
+def analizar_archivo(archivo_gramatica, archivo_entradas, procesos=None, estadisticas=None):
+    with estadisticas.fase("lectura") if estadisticas is not None else nullcontext():
+        reglas = cargar_archivo(archivo_gramatica)
+        with open(archivo_entradas, "r") as f:
+            cadenas = [linea.strip() for linea in f]
+    return analizar_lote(cadenas, compilar_gramatica(reglas, estadisticas), procesos,
+                         estadisticas=estadisticas)
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    estadisticas = None
+    if "--estadisticas" in argumentos:
+        k = argumentos.index("--estadisticas")
+        ruta_estadisticas = argumentos[k + 1]
+        del argumentos[k:k + 2]
+        estadisticas = Estadisticas()
+    if len(argumentos) < 2:
+        print("Uso: python lote.py gramatica.txt entradas.txt [procesos] [--estadisticas salida.json]")
+        sys.exit(1)
+    procesos = int(argumentos[2]) if len(argumentos) > 2 else None
+    resultados = analizar_archivo(argumentos[0], argumentos[1], procesos, estadisticas)
+    if estadisticas is not None:
+        with open(ruta_estadisticas, "w", encoding="utf-8") as f:
+            f.write(estadisticas.a_json(indent=2) + "\n")
+    for linea, (valida, posicion, mensaje) in enumerate(resultados, 1):
+        if valida:
+            print(f"{linea}: CADENA VÁLIDA")
+        else:
+            print(f"{linea}: CADENA NO VÁLIDA (token {posicion}) {mensaje}")
@@ -1,117 +1,9 @@
 import re
 import json
 
-# Leer gramática desde archivo
-def leer_gramatica(archivo):
-    with open(archivo, "r") as f:
-        reglas_raw = f.readlines()
-    reglas = []
-    for linea in reglas_raw:
-        izq, der = linea.strip().split("->")
-        izq = izq.strip()
-        der = der.strip()
-        if der == '#':
-            reglas.append((izq, ['#']))
-        else:
-            reglas.append((izq, der.split()))
-    return reglas
-
-
-# Extraer símbolos
-def obtener_simbolos(reglas):
-    variables = set()
-    terminales = set()
-    for izq, der in reglas:
-        variables.add(izq)
-        for simbolo in der:
-            if not simbolo.isupper() and simbolo != '#':
-                terminales.add(simbolo)
-            elif simbolo.isupper() and simbolo != izq:
-                variables.add(simbolo)
-    return list(variables), list(terminales)
-
-
-# Inicializar estructura de símbolos
-def inicializar_gramatica(variables, terminales, inicio):
-    grammar = {}
-    for v in variables:
-        grammar[v] = {"tipo": "V", "first": [], "follow": []}
-    grammar[inicio]["tipo"] = "I"
-    for t in terminales:
-        grammar[t] = {"tipo": "T", "first": [t]}
-    grammar[inicio]["follow"] = ["$"]
-    return grammar
-
-
-# Calcular FIRST
-def calcular_first(reglas, grammar):
-    cambio = True
-    while cambio:
-        cambio = False
-        for izq, der in reglas:
-            if der == ['#']:
-                if '#' not in grammar[izq]['first']:
-                    grammar[izq]['first'].append('#')
-                    cambio = True
-            else:
-                for simbolo in der:
-                    nuevos = [x for x in grammar[simbolo]['first'] if x != '#']
-                    if not set(nuevos).issubset(grammar[izq]['first']):
-                        grammar[izq]['first'].extend(nuevos)
-                        cambio = True
-                    if '#' not in grammar[simbolo]['first']:
-                        break
-                else:
-                    if '#' not in grammar[izq]['first']:
-                        grammar[izq]['first'].append('#')
-                        cambio = True
-
-
-# Calcular FOLLOW
-def calcular_follow(reglas, grammar):
-    cambio = True
-    while cambio:
-        cambio = False
-        for izq, der in reglas:
-            for i in range(len(der)):
-                simbolo = der[i]
-                if simbolo in grammar and grammar[simbolo]['tipo'] in ['V', 'I']:
-                    siguiente = der[i + 1:]
-                    temp = []
-                    for s in siguiente:
-                        temp += [x for x in grammar[s]['first'] if x != '#']
-                        if '#' not in grammar[s]['first']:
-                            break
-                    else:
-                        temp += grammar[izq]['follow']
-                    if not set(temp).issubset(grammar[simbolo]['follow']):
-                        grammar[simbolo]['follow'].extend(temp)
-                        cambio = True
-
-
-# Construir tabla LL(1)
-def construir_tabla_ll1(reglas, grammar, terminales):
-    tabla = {v: {t: set() for t in terminales + ['$']} for v in grammar if grammar[v]['tipo'] in ['V', 'I']}
-    for izq, der in reglas:
-        first_alpha = []
-        if der == ['#']:
-            for f in grammar[izq]['follow']:
-                tabla[izq][f].add((izq, tuple(der)))
-        else:
-            for s in der:
-                first_alpha += [x for x in grammar[s]['first'] if x != '#']
-                if '#' not in grammar[s]['first']:
-                    break
-            else:
-                first_alpha.append('#')
-
-            for t in first_alpha:
-                if t != '#':
-                    tabla[izq][t].add((izq, tuple(der)))
-            if '#' in first_alpha:
-                for f in grammar[izq]['follow']:
-                    tabla[izq][f].add((izq, tuple(der)))
-    return tabla
+from parser import EPSILON, detectar_conflictos
+from cache_gramatica import cargar_analisis
+from cargador import cargar_archivo
 
 
 # Imprimir tabla con EXT/EXP
@@ -142,6 +34,17 @@ def imprimir_matriz_ll1(tabla, terminales, grammar):
         print(fila)
 
 
+# Imprimir conflictos de la tabla
+def imprimir_conflictos(tabla, grammar):
+    conflictos = detectar_conflictos(tabla, grammar)
+    if not conflictos:
+        print("\nLa gramática es LL(1): ninguna celda tiene más de una producción.")
+        return
+    print(f"\nCONFLICTOS LL(1) ({len(conflictos)})")
+    for nt, t, tipo, producciones in conflictos:
+        print(f"  [{nt}, {t}] {tipo}: " + " / ".join(f"{izq} → {' '.join(der)}" for izq, der in producciones))
+
+
 # Imprimir FIRST y FOLLOW
 def imprimir_tablas(grammar):
     print("\nTABLAS FIRST y FOLLOW")
@@ -182,11 +85,11 @@ def analizar_cadena(cadena, tabla, grammar, inicio):
         if grammar.get(tope, {}).get("tipo") in ["I", "V"]:
             reglas = list(tabla[tope].get(simbolo, []))
             if reglas:
-                regla = reglas[0]
+                regla = min(reglas)
                 pila.pop()
-                if list(regla[1]) != ['#']:
+                if list(regla[1]) != [EPSILON]:
                     pila += list(reversed(regla[1]))
-                produccion_str = f"{regla[0]} → {' '.join(regla[1]) if list(regla[1]) != ['#'] else 'ε'}"
+                produccion_str = f"{regla[0]} → {' '.join(regla[1]) if list(regla[1]) != [EPSILON] else EPSILON}"
                 print(f"{' '.join(pila):<30} {' '.join(cadena):<30} Regla: {produccion_str}")
             else:
                 print(f"{pila_str:<30} {entrada_str:<30} Error: no hay regla para {tope} con '{simbolo}'")
@@ -211,16 +114,12 @@ def analizar_cadena(cadena, tabla, grammar, inicio):
 
 
 # main(){}
-reglas = leer_gramatica("grammar.txt")
-variables, terminales = obtener_simbolos(reglas)
-inicio = reglas[0][0]
-grammar = inicializar_gramatica(variables, terminales, inicio)
-calcular_first(reglas, grammar)
-calcular_follow(reglas, grammar)
-tabla = construir_tabla_ll1(reglas, grammar, terminales)
+reglas = cargar_archivo("grammar.txt")
+grammar, tabla, terminales, inicio, _ = cargar_analisis(reglas)
 
 imprimir_tablas(grammar)
 imprimir_matriz_ll1(tabla, terminales, grammar)
+imprimir_conflictos(tabla, grammar)
 
 with open("input.txt", "r") as f:
     entrada = f.readline().strip()
@@ -1,6 +1,8 @@
 # parser.py
 from collections import defaultdict
-import pandas as pd
+from contextlib import nullcontext
+
+import conjuntos
 
 EPSILON = 'ε'
 
@@ -10,13 +12,17 @@ def reemplazar_epsilon(reglas):
     return [(izq, [EPSILON] if der == ['#'] else der) for izq, der in reglas]
 
 
+def es_variable(simbolo):
+    return simbolo.isupper()
+
+
 def extraer_variables_terminales(reglas):
     variables = set()
     terminales = set()
     for izq, der in reglas:
         variables.add(izq)
         for simbolo in der:
-            if simbolo.isupper():
+            if es_variable(simbolo):
                 variables.add(simbolo)
             elif simbolo != EPSILON:
                 terminales.add(simbolo)
@@ -99,6 +105,12 @@ def es_ll1(reglas):
     return not tiene_recursion_izquierda(reglas) and not tiene_factorizacion_izquierda(reglas)
 
 
+# Lectura de reglas en texto ("A -> x B | ε", con '#' también como vacía); ver cargador.py
+def leer_reglas(lineas):
+    from cargador import cargar_reglas
+    return cargar_reglas(lineas)
+
+
 # Inicialización y cálculos para la gramática
 def inicializar_gramatica(variables, terminales, inicio):
     grammar = {}
@@ -158,7 +170,20 @@ def calcular_follow(reglas, grammar):
                         cambio = True
 
 
-def construir_tabla_ll1(reglas, grammar, terminales):
+class ConflictoLL1(ValueError):
+    def __init__(self, conflictos):
+        self.conflictos = conflictos
+        detalle = "; ".join(
+            f"{tipo} en [{nt}, {t}]: " + " / ".join(f"{izq} → {' '.join(der)}" for izq, der in prods)
+            for nt, t, tipo, prods in conflictos
+        )
+        super().__init__(f"La gramática no es LL(1): {detalle}")
+
+
+def construir_tabla_ll1(reglas, grammar, terminales, estricto=False):
+    """
+    Con estricto=True lanza ConflictoLL1 si alguna celda queda con más de una producción.
+    """
     tabla = {v: {t: set() for t in terminales + ['$']} for v in grammar if grammar[v]['tipo'] in ['V', 'I']}
     for izq, der in reglas:
         first_alpha = []
@@ -185,14 +210,78 @@ def construir_tabla_ll1(reglas, grammar, terminales):
             if EPSILON in first_alpha:
                 for f in grammar[izq]['follow']:
                     tabla[izq][f].add((izq, tuple(der)))
+    if estricto:
+        conflictos = detectar_conflictos(tabla, grammar)
+        if conflictos:
+            raise ConflictoLL1(conflictos)
     return tabla
 
 
-def analizar_cadena(cadena, tabla, grammar, inicio):
+def first_secuencia(der, grammar):
     """
-    Analiza una cadena mediante el método LL(1) y devuelve un DataFrame con el seguimiento.
+    Devuelve (FIRST sin ε, anulable) de una secuencia de símbolos.
+    """
+    first = set()
+    for s in der:
+        if s == EPSILON:
+            continue
+        first_s = grammar[s]['first']
+        first.update(x for x in first_s if x != EPSILON)
+        if EPSILON not in first_s:
+            return first, False
+    return first, True
+
+
+def detectar_conflictos(tabla, grammar):
+    """
+    Recorre la tabla y devuelve una lista de (no_terminal, terminal, tipo, producciones)
+    por cada celda con más de una producción. El tipo es FIRST/FIRST cuando dos producciones
+    compiten por el mismo terminal (o ambas derivan ε) y FIRST/FOLLOW cuando una de ellas
+    entra por anulable con el terminal en FOLLOW.
+    """
+    conflictos = []
+    for nt, fila in tabla.items():
+        for t, reglas_celda in fila.items():
+            if len(reglas_celda) < 2:
+                continue
+            producciones = sorted(reglas_celda)
+            por_first = 0
+            por_follow = 0
+            for _, der in producciones:
+                first, anulable = first_secuencia(der, grammar)
+                if t in first:
+                    por_first += 1
+                if anulable:
+                    por_follow += 1
+            tipo = "FIRST/FIRST" if por_first > 1 or por_follow > 1 else "FIRST/FOLLOW"
+            conflictos.append((nt, t, tipo, producciones))
+    return conflictos
+
+
+def _sin_medir(nombre):
+    return nullcontext()
+
+
+def preparar_gramatica(reglas, estricto=False, estadisticas=None):
+    # Con estadisticas (instrumentacion.Estadisticas) se mide cada fase por separado
+    fase = estadisticas.fase if estadisticas is not None else _sin_medir
+    variables, terminales = extraer_variables_terminales(reglas)
+    inicio = reglas[0][0]
+    grammar = inicializar_gramatica(variables, terminales, inicio)
+    with fase("first"):
+        conjuntos.calcular_first(reglas, grammar, EPSILON)
+    with fase("follow"):
+        conjuntos.calcular_follow(reglas, grammar, EPSILON)
+    with fase("tabla"):
+        tabla = construir_tabla_ll1(reglas, grammar, terminales, estricto)
+    return grammar, tabla, terminales, inicio
+
+
+def trazar_cadena(cadena, tabla, grammar, inicio):
+    """
+    Analiza una cadena mediante el método LL(1) y genera el seguimiento paso a paso
+    como tuplas (pila, entrada, acción).
     """
-    output = []
     cadena = cadena.strip().split() + ["$"]
     pila = ["$", inicio]
 
@@ -201,13 +290,13 @@ def analizar_cadena(cadena, tabla, grammar, inicio):
         entrada_str = ' '.join(cadena)
 
         if pila == ["$"] and cadena == ["$"]:
-            output.append((pila_str, entrada_str, "CADENA VÁLIDA"))
-            break
+            yield (pila_str, entrada_str, "CADENA VÁLIDA")
+            return
 
         if not pila:
-            output.append((pila_str, entrada_str, "Error: pila vacía"))
-            output.append(("", "", "CADENA NO VÁLIDA"))
-            break
+            yield (pila_str, entrada_str, "Error: pila vacía")
+            yield ("", "", "CADENA NO VÁLIDA")
+            return
 
         tope = pila[-1]
         simbolo = cadena[0]
@@ -215,30 +304,162 @@ def analizar_cadena(cadena, tabla, grammar, inicio):
         if grammar.get(tope, {}).get("tipo") in ["I", "V"]:
             reglas = list(tabla[tope].get(simbolo, []))
             if reglas:
-                regla = reglas[0]  # Tomamos la primera regla (podría haber conflictos)
+                regla = min(reglas)  # Con conflictos se elige siempre la misma regla
                 pila.pop()
                 if list(regla[1]) != [EPSILON]:
                     pila.extend(reversed(list(regla[1])))
                 produccion_str = f"{regla[0]} → {' '.join(regla[1]) if list(regla[1]) != [EPSILON] else EPSILON}"
-                output.append((' '.join(pila), ' '.join(cadena), f"Regla: {produccion_str}"))
+                yield (' '.join(pila), ' '.join(cadena), f"Regla: {produccion_str}")
             else:
-                output.append((pila_str, entrada_str, f"Error: no hay regla para {tope} con '{simbolo}'"))
-                output.append(("", "", "CADENA NO VÁLIDA"))
-                break
+                yield (pila_str, entrada_str, f"Error: no hay regla para {tope} con '{simbolo}'")
+                yield ("", "", "CADENA NO VÁLIDA")
+                return
 
         elif grammar.get(tope, {}).get("tipo") == "T":
             if tope == simbolo:
                 pila.pop()
                 cadena.pop(0)
-                output.append((' '.join(pila), ' '.join(cadena), f"Match: {simbolo}"))
+                yield (' '.join(pila), ' '.join(cadena), f"Match: {simbolo}")
             else:
-                output.append((pila_str, entrada_str, f"Error: se esperaba '{tope}' pero se encontró '{simbolo}'"))
-                output.append(("", "", "CADENA NO VÁLIDA"))
+                yield (pila_str, entrada_str, f"Error: se esperaba '{tope}' pero se encontró '{simbolo}'")
+                yield ("", "", "CADENA NO VÁLIDA")
+                return
+
+        else:
+            yield (pila_str, entrada_str, "Error: símbolo desconocido en pila")
+            yield ("", "", "CADENA NO VÁLIDA")
+            return
+
+
+
+def analizar_cadena(cadena, tabla, grammar, inicio):
+    """
+    Analiza una cadena mediante el método LL(1) y devuelve un DataFrame con el seguimiento.
+    Necesita pandas, que solo se importa al llamarla.
+    """
+    from presentacion import traza_a_dataframe
+    return traza_a_dataframe(trazar_cadena(cadena, tabla, grammar, inicio))
+
+
+def reconocer_cadena(cadena, tabla, grammar, inicio):
+    """
+    Reconoce una cadena mediante el método LL(1) sin construir la traza.
+    Devuelve (valida, posicion, mensaje); en una cadena válida posicion y mensaje son None,
+    y en caso de error posicion es el índice del token donde se detuvo el análisis.
+    """
+    tokens = cadena.split()
+    tokens.append("$")
+    fin = len(tokens) - 1
+    pila = ["$", inicio]
+    i = 0
+
+    while True:
+        tope = pila[-1] if pila else None
+        simbolo = tokens[i]
+
+        # Solo el '$' final cierra la cadena; un '$' escrito en la entrada no
+        if tope == "$" and i == fin:
+            return True, None, None
+
+        if tope is None:
+            return False, i, "Error: pila vacía"
+
+        tipo = grammar.get(tope, {}).get("tipo")
+        if tipo in ("I", "V"):
+            reglas = tabla[tope].get(simbolo)
+            if not reglas:
+                return False, i, f"Error: no hay regla para {tope} con '{simbolo}'"
+            der = min(reglas)[1]
+            pila.pop()
+            if der != (EPSILON,):
+                pila.extend(reversed(der))
+
+        elif tipo == "T":
+            if tope != simbolo:
+                return False, i, f"Error: se esperaba '{tope}' pero se encontró '{simbolo}'"
+            pila.pop()
+            i += 1
+
+        else:
+            return False, i, "Error: símbolo desconocido en pila"
+
+
+def accion_sincronizacion(nt, terminal, grammar):
+    """
+    Acción de recuperación de una celda vacía: EXT (extraer el no terminal de la pila)
+    si el terminal está en su FOLLOW o es '$', EXP (explorar, saltando el token) si no.
+    """
+    if terminal == "$" or terminal in grammar[nt]['follow']:
+        return "EXT"
+    return "EXP"
+
+
+def reconocer_con_recuperacion(cadena, tabla, grammar, inicio, max_errores=100):
+    """
+    Reconoce una cadena recuperándose de los errores en modo pánico con las decisiones
+    EXT/EXP de la tabla. Devuelve (valida, diagnosticos) donde diagnosticos es una lista
+    de (posicion, mensaje) con como mucho max_errores elementos.
+    Tras un error no se informa de otro hasta volver a emparejar un terminal, para no
+    repetir el mismo fallo en cascada.
+    """
+    if max_errores < 1:
+        raise ValueError("max_errores debe ser al menos 1")
+    tokens = cadena.split()
+    tokens.append("$")
+    fin = len(tokens) - 1
+    pila = ["$", inicio]
+    i = 0
+    diagnosticos = []
+    recuperando = False
+
+    def reportar(mensaje):
+        nonlocal recuperando
+        if not recuperando:
+            diagnosticos.append((i, mensaje))
+            recuperando = True
+
+    while len(diagnosticos) < max_errores:
+        tope = pila[-1]
+        simbolo = tokens[i]
+
+        if tope == "$":
+            if i == fin:
                 break
+            # La pila se vació antes que la entrada: se salta el token y se vuelve a
+            # empezar desde el símbolo inicial para seguir revisando el resto
+            reportar(f"Error: entrada sobrante '{simbolo}'")
+            i += 1
+            if i < fin:
+                pila.append(inicio)
+            continue
+
+        tipo = grammar.get(tope, {}).get("tipo")
+        if tipo in ("I", "V"):
+            reglas = tabla[tope].get(simbolo)
+            if reglas:
+                der = min(reglas)[1]
+                pila.pop()
+                if der != (EPSILON,):
+                    pila.extend(reversed(der))
+                continue
+            reportar(f"Error: no hay regla para {tope} con '{simbolo}'")
+            if accion_sincronizacion(tope, simbolo, grammar) == "EXT":
+                pila.pop()
+            else:
+                i += 1
+
+        elif tipo == "T":
+            if tope == simbolo:
+                pila.pop()
+                i += 1
+                recuperando = False
+            else:
+                # Se da por insertado el terminal esperado
+                reportar(f"Error: se esperaba '{tope}' pero se encontró '{simbolo}'")
+                pila.pop()
 
         else:
-            output.append((pila_str, entrada_str, "Error: símbolo desconocido en pila"))
-            output.append(("", "", "CADENA NO VÁLIDA"))
-            break
+            reportar("Error: símbolo desconocido en pila")
+            pila.pop()
 
-    return pd.DataFrame(output, columns=["Pila", "Entrada", "Acción"])
\ No newline at end of file
+    return not diagnosticos, diagnosticos
@@ -0,0 +1,38 @@
+# presentacion.py
+# Adaptadores a pandas para mostrar los resultados del núcleo (parser.py).
+# Solo lo importan quienes necesitan DataFrames, como streamlit_app.py.
+import pandas as pd
+
+from parser import EPSILON, accion_sincronizacion
+
+
+def traza_a_dataframe(traza):
+    return pd.DataFrame(list(traza), columns=["Pila", "Entrada", "Acción"])
+
+
+def tabla_simbolos_dataframe(grammar):
+    data = []
+    for simbolo, info in grammar.items():
+        if info['tipo'] in ['V', 'I']:
+            data.append({
+                "Símbolo": simbolo,
+                "FIRST": ', '.join(info['first']),
+                "FOLLOW": ', '.join(info['follow'])
+            })
+    return pd.DataFrame(data)
+
+
+def tabla_ll1_dataframe(tabla, grammar, terminales):
+    ll1_data = {nt: {} for nt in tabla}
+    columnas = terminales + ['$']
+
+    for nt in tabla:
+        for t in columnas:
+            reglas_set = tabla[nt][t]
+            if reglas_set:
+                reglas_str = ' | '.join(f"{izq} → {' '.join(der) if der != (EPSILON,) else EPSILON}" for izq, der in reglas_set)
+                ll1_data[nt][t] = reglas_str
+            else:
+                ll1_data[nt][t] = accion_sincronizacion(nt, t, grammar)
+
+    return pd.DataFrame(ll1_data).fillna("-").T
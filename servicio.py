@@ -0,0 +1,313 @@
+# servicio.py
+# Servicio asíncrono de análisis: carga cada gramática una vez y atiende peticiones por
+# HTTP/JSON local o por líneas JSON en stdin/stdout. El bucle de eventos solo reparte
+# trabajo; el análisis se hace en un pool de procesos y las peticiones pequeñas que llegan
+# juntas se envían al pool en un mismo lote.
+#
+#   python servicio.py --http 127.0.0.1:8765 [--procesos N] [--gramatica archivo.txt ...]
+#   python servicio.py --stdio
+#
+# HTTP:  POST /gramaticas {"gramatica": "E -> ..."}            -> {"clave": ..., "conflictos": n}
+#        POST /validar    {"clave": ..., "cadena": "id + id"}   -> {"valida": ..., "posicion": ..., "mensaje": ...}
+#        POST /analizar   igual, y además "arbol": {"simbolos", "producciones", "tamanos"}, el
+#                         árbol en preorden como listas planas (ver arbol.ArbolSintactico)
+#        Con "cadenas": [...] en lugar de "cadena" se devuelve {"resultados": [...]}.
+#        GET  /salud
+# stdio: una petición JSON por línea con "op" ("gramatica", "validar", "analizar") y un "id"
+#        opcional que se copia en la respuesta; las respuestas pueden llegar desordenadas.
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from arbol import analizar_arbol
+from cache_gramatica import DIRECTORIO, cargar_analisis, cargar_analisis_guardado, clave_gramatica
+from cargador import cargar_reglas
+from parser import detectar_conflictos
+from tabla_compilada import reconocer_compilado
+
+# Tablas compiladas de cada proceso trabajador, por clave de gramática
+_tablas = {}
+
+
+class TablaNoDisponible(LookupError):
+    pass
+
+
+def _leer_texto(texto):
+    return cargar_reglas(texto.splitlines())
+
+
+def _registrar_en_trabajador(texto, directorio):
+    # La lectura del texto también se hace aquí, fuera del bucle de eventos
+    reglas = _leer_texto(texto)
+    grammar, tabla, _, _, compilada = cargar_analisis(reglas, directorio, completa=False)
+    clave = clave_gramatica(reglas)
+    _tablas[clave] = compilada
+    return clave, len(detectar_conflictos(tabla, grammar))
+
+
+def _tabla(clave, directorio, texto):
+    compilada = _tablas.get(clave)
+    if compilada is None:
+        # Otro trabajador ya la compiló y la dejó en la caché en disco; se mapea sin copiarla
+        guardado = cargar_analisis_guardado(os.path.join(directorio, clave + ".ll1"), mapear=True,
+                                            completa=False)
+        if guardado is None:
+            if texto is None:
+                raise TablaNoDisponible(clave)
+            guardado = cargar_analisis(_leer_texto(texto), directorio, completa=False)
+        compilada = _tablas[clave] = guardado[4]
+    return compilada
+
+
+def _resultado(valida, posicion, mensaje):
+    return {"valida": valida, "posicion": posicion, "mensaje": mensaje}
+
+
+def _procesar_bloque(clave, directorio, modo, cadenas, texto=None):
+    compilada = _tabla(clave, directorio, texto)
+    if modo == "validar":
+        return [_resultado(*reconocer_compilado(c, compilada)) for c in cadenas]
+    resultados = []
+    for c in cadenas:
+        valida, posicion, mensaje, arbol = analizar_arbol(c, compilada)
+        respuesta = _resultado(valida, posicion, mensaje)
+        # Listas planas: un árbol profundo anidado no se puede serializar (ni con pickle
+        # ni con json) sin agotar la recursión
+        respuesta["arbol"] = arbol.a_plano()
+        resultados.append(respuesta)
+    return resultados
+
+
+class Servicio:
+    """
+    Núcleo del servicio, independiente del protocolo. `espera` son los segundos que se
+    esperan a que lleguen más peticiones antes de enviar un lote de como mucho `max_lote`.
+    """
+
+    def __init__(self, procesos=None, max_lote=256, espera=0.002, directorio=DIRECTORIO):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.max_lote = max_lote
+        self.espera = espera
+        self.directorio = directorio
+        self.gramaticas = {}    # clave -> texto de la gramática
+        self.registradas = {}   # texto de la gramática -> respuesta de registrar
+        self.ejecutor = None
+        self.cola = None
+        self.repartidor = None
+
+    async def iniciar(self):
+        self.ejecutor = ProcessPoolExecutor(self.procesos)
+        self.cola = asyncio.Queue()
+        self.repartidor = asyncio.create_task(self._repartir())
+
+    async def cerrar(self):
+        self.repartidor.cancel()
+        self.ejecutor.shutdown(cancel_futures=True)
+
+    async def registrar(self, texto):
+        """
+        Compila una gramática (en un trabajador, que la deja en la caché en disco) y
+        devuelve {"clave", "conflictos"}. El mismo texto solo se compila una vez.
+        """
+        if texto in self.registradas:
+            return self.registradas[texto]
+        loop = asyncio.get_running_loop()
+        clave, conflictos = await loop.run_in_executor(
+            self.ejecutor, _registrar_en_trabajador, texto, self.directorio)
+        self.gramaticas[clave] = texto
+        respuesta = self.registradas[texto] = {"clave": clave, "conflictos": conflictos}
+        return respuesta
+
+    async def analizar(self, clave, cadena, modo="validar"):
+        if clave not in self.gramaticas:
+            raise KeyError(clave)
+        futuro = asyncio.get_running_loop().create_future()
+        self.cola.put_nowait((clave, modo, cadena, futuro))
+        return await futuro
+
+    async def _repartir(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self.cola.get()]
+            limite = loop.time() + self.espera
+            while len(lote) < self.max_lote:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self.cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            grupos = {}
+            for clave, modo, cadena, futuro in lote:
+                grupos.setdefault((clave, modo), []).append((cadena, futuro))
+            for (clave, modo), peticiones in grupos.items():
+                asyncio.create_task(self._enviar(clave, modo, peticiones))
+
+    async def _enviar(self, clave, modo, peticiones):
+        loop = asyncio.get_running_loop()
+        cadenas = [cadena for cadena, _ in peticiones]
+        try:
+            try:
+                resultados = await loop.run_in_executor(
+                    self.ejecutor, _procesar_bloque, clave, self.directorio, modo, cadenas)
+            except TablaNoDisponible:
+                # Sin caché en disco (p. ej. sin permisos) el trabajador la compila desde el texto
+                resultados = await loop.run_in_executor(
+                    self.ejecutor, _procesar_bloque, clave, self.directorio, modo, cadenas,
+                    self.gramaticas[clave])
+        except Exception as e:
+            for _, futuro in peticiones:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            return
+        for (_, futuro), resultado in zip(peticiones, resultados):
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+    async def atender(self, peticion):
+        """
+        Atiende una petición ya decodificada ({"op", ...}) y devuelve el diccionario de respuesta.
+        """
+        op = peticion.get("op")
+        if op == "gramatica":
+            return await self.registrar(peticion["gramatica"])
+        if op not in ("validar", "analizar"):
+            raise ValueError(f"operación desconocida '{op}'")
+        clave = peticion.get("clave")
+        if clave is None:
+            clave = (await self.registrar(peticion["gramatica"]))["clave"]
+        if "cadenas" in peticion:
+            resultados = await asyncio.gather(*(self.analizar(clave, c, op) for c in peticion["cadenas"]))
+            return {"resultados": resultados}
+        return await self.analizar(clave, peticion["cadena"], op)
+
+
+def _error(e):
+    if isinstance(e, KeyError):
+        return 404, {"error": f"gramática no registrada o campo ausente: {e.args[0]}"}
+    if isinstance(e, (ValueError, TypeError)):
+        return 400, {"error": str(e)}
+    return 500, {"error": str(e)}
+
+
+# HTTP/1.1 mínimo, con conexiones persistentes
+RUTAS = {"/gramaticas": "gramatica", "/validar": "validar", "/analizar": "analizar"}
+ESTADOS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+async def _atender_http(servicio, lector, escritor):
+    try:
+        while True:
+            linea = await lector.readline()
+            if not linea.strip():
+                break
+            metodo, ruta, _ = linea.decode("latin-1").split(" ", 2)
+            cabeceras = {}
+            while True:
+                linea = await lector.readline()
+                if linea in (b"\r\n", b"\n", b""):
+                    break
+                nombre, _, valor = linea.decode("latin-1").partition(":")
+                cabeceras[nombre.strip().lower()] = valor.strip()
+            cuerpo = await lector.readexactly(int(cabeceras.get("content-length", 0)))
+
+            if metodo == "GET" and ruta == "/salud":
+                estado, respuesta = 200, {"estado": "ok", "gramaticas": len(servicio.gramaticas)}
+            elif ruta not in RUTAS:
+                estado, respuesta = 404, {"error": f"ruta desconocida '{ruta}'"}
+            elif metodo != "POST":
+                estado, respuesta = 405, {"error": "usar POST"}
+            else:
+                try:
+                    peticion = json.loads(cuerpo)
+                    peticion["op"] = RUTAS[ruta]
+                    estado, respuesta = 200, await servicio.atender(peticion)
+                except Exception as e:
+                    estado, respuesta = _error(e)
+
+            datos = json.dumps(respuesta, ensure_ascii=False).encode()
+            escritor.write(
+                f"HTTP/1.1 {estado} {ESTADOS[estado]}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(datos)}\r\n\r\n".encode() + datos)
+            await escritor.drain()
+            if cabeceras.get("connection", "").lower() == "close":
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        escritor.close()
+
+
+async def servir_http(servicio, anfitrion="127.0.0.1", puerto=8765):
+    servidor = await asyncio.start_server(
+        lambda lector, escritor: _atender_http(servicio, lector, escritor), anfitrion, puerto)
+    async with servidor:
+        await servidor.serve_forever()
+
+
+async def servir_stdio(servicio):
+    loop = asyncio.get_running_loop()
+    pendientes = set()
+
+    async def responder(linea):
+        identificador = None
+        try:
+            peticion = json.loads(linea)
+            identificador = peticion.get("id")
+            respuesta = await servicio.atender(peticion)
+        except Exception as e:
+            respuesta = _error(e)[1]
+        if identificador is not None:
+            respuesta = dict(respuesta, id=identificador)
+        sys.stdout.write(json.dumps(respuesta, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+    while True:
+        # La lectura bloqueante va a un hilo (sirve igual con tuberías, archivos o terminal)
+        linea = await loop.run_in_executor(None, sys.stdin.readline)
+        if not linea:
+            break
+        if linea.strip():
+            tarea = asyncio.create_task(responder(linea))
+            pendientes.add(tarea)
+            tarea.add_done_callback(pendientes.discard)
+    if pendientes:
+        await asyncio.wait(pendientes)
+
+
+async def principal(args):
+    servicio = Servicio(args.procesos, args.max_lote, args.espera / 1000)
+    await servicio.iniciar()
+    try:
+        for ruta in args.gramatica:
+            with open(ruta, "r", encoding="utf-8") as f:
+                registrada = await servicio.registrar(f.read())
+            print(f"{ruta}: {registrada['clave']}", file=sys.stderr)
+        if args.stdio:
+            await servir_stdio(servicio)
+        else:
+            anfitrion, _, puerto = args.http.rpartition(":")
+            await servir_http(servicio, anfitrion or "127.0.0.1", int(puerto))
+    finally:
+        await servicio.cerrar()
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Servicio de análisis LL(1)")
+    argumentos.add_argument("--http", default="127.0.0.1:8765", help="dirección anfitrión:puerto")
+    argumentos.add_argument("--stdio", action="store_true", help="líneas JSON por stdin/stdout")
+    argumentos.add_argument("--procesos", type=int, default=None)
+    argumentos.add_argument("--max-lote", type=int, default=256)
+    argumentos.add_argument("--espera", type=float, default=2.0, help="milisegundos para juntar un lote")
+    argumentos.add_argument("--gramatica", action="append", default=[], help="gramática a precargar")
+    try:
+        asyncio.run(principal(argumentos.parse_args()))
+    except KeyboardInterrupt:
+        pass
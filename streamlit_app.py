@@ -1,12 +1,78 @@
 import streamlit as st
-import pandas as pd
-from parser import (
-    reemplazar_epsilon, extraer_variables_terminales,
-    eliminar_recursion_izquierda, factorizar_por_izquierda,
-    tiene_recursion_izquierda, tiene_factorizacion_izquierda,
-    es_ll1, inicializar_gramatica, calcular_first, calcular_follow,
-    construir_tabla_ll1, analizar_cadena
-)
+from parser import detectar_conflictos
+from cargador import ErrorGramatica, cargar_reglas
+from presentacion import tabla_ll1_dataframe, tabla_simbolos_dataframe, traza_a_dataframe
+from cache_gramatica import cargar_analisis
+from transformaciones import simplificar_gramatica, transformar_gramatica
+from traza import TrazaPerezosa
+
+MAX_GRAMATICAS_EN_DISCO = 64
+
+# Los resultados se memorizan por texto de gramática (y por cadena en el análisis), con un
+# número máximo de entradas para que la memoria del servidor no crezca sin límite.
+@st.cache_data(max_entries=32, show_spinner=False)
+def procesar_gramatica(gram_input):
+    reglas = cargar_reglas(gram_input.splitlines())
+    avisos = []
+
+    # Eliminar recursión por izquierda (también indirecta) y factorizar hasta punto fijo
+    try:
+        transformadas, pasos = transformar_gramatica(reglas)
+    except ValueError as e:
+        avisos.append(("⚠️ No se pudo eliminar la recursión por izquierda.", str(e)))
+    else:
+        listado = '\n'.join(f"{izq} -> {' '.join(der)}" for izq, der in transformadas)
+        if "recursión" in pasos:
+            avisos.append(("⚠️ Recursión por izquierda eliminada.", listado))
+        if "factorización" in pasos:
+            avisos.append(("⚠️ Gramática factorizada por izquierda.", listado))
+        reglas = transformadas
+
+    # Quitar símbolos inútiles y colapsar producciones unitarias antes de construir la tabla
+    try:
+        simplificadas, informe = simplificar_gramatica(reglas)
+    except ValueError as e:
+        avisos.append(("⚠️ No se pudo simplificar la gramática.", str(e)))
+    else:
+        eliminado = [
+            f"{titulo}: {', '.join(informe[clave])}"
+            for clave, titulo in (("no_generadores", "No generadores"), ("inalcanzables", "Inalcanzables"),
+                                  ("terminales", "Terminales sin uso"))
+            if informe[clave]
+        ]
+        if informe["unitarias"]:
+            eliminado.append("Unitarias colapsadas: " + ", ".join(f"{a} -> {b}" for a, b in informe["unitarias"]))
+        if eliminado:
+            avisos.append(("⚠️ Gramática simplificada.", '\n'.join(eliminado)))
+        reglas = simplificadas
+
+    # FIRST/FOLLOW y tabla LL(1), desde la caché en disco si la gramática ya se procesó.
+    # Cada edición es una gramática nueva, así que el disco guarda solo las más recientes.
+    grammar, tabla, terminales, inicio, _ = cargar_analisis(reglas, max_archivos=MAX_GRAMATICAS_EN_DISCO)
+
+    simbolos_df = tabla_simbolos_dataframe(grammar)
+    ll1_df = tabla_ll1_dataframe(tabla, grammar, terminales)
+
+    conflictos = [
+        f"{tipo} en [{nt}, {t}]: " + " | ".join(f"{izq} → {' '.join(der)}" for izq, der in prods)
+        for nt, t, tipo, prods in detectar_conflictos(tabla, grammar)
+    ]
+
+    return avisos, conflictos, grammar, tabla, inicio, simbolos_df, ll1_df
+
+
+FILAS_POR_PAGINA = 200
+MAX_SIMBOLOS = 60
+
+
+# La traza se guarda como registro compacto; solo se reconstruyen las filas de la página visible.
+# cache_resource devuelve el mismo objeto en cada ejecución (cache_data lo copiaría entero al
+# cambiar de página); se puede compartir porque TrazaPerezosa no cambia tras construirse.
+@st.cache_resource(max_entries=256, show_spinner=False)
+def analizar(gram_input, input_str):
+    _, _, grammar, tabla, inicio, _, _ = procesar_gramatica(gram_input)
+    return TrazaPerezosa(input_str, tabla, grammar, inicio, max_simbolos=MAX_SIMBOLOS)
+
 
 st.set_page_config(page_title="Analizador LL(1)", layout="wide")
 st.title("🔍 Analizador Sintáctico LL(1)")
@@ -24,78 +90,41 @@ F -> ( E ) | id""",
 
 input_str = st.text_input("✍️ Cadena a analizar (tokens separados por espacio):", "id + id * id")
 
+# El botón solo activa la vista; al cambiar de página la app se vuelve a ejecutar sin pulsarlo
 if st.button("Procesar Gramática"):
-    # Procesar las reglas de la gramática
-    reglas_raw = [line.strip() for line in gram_input.strip().splitlines() if line.strip()]
-    reglas = []
-    for linea in reglas_raw:
-        izq, der = linea.split("->")
-        izq = izq.strip()
-        for alt in der.split("|"):
-            prod = alt.strip().split()
-            reglas.append((izq, prod if prod != ['ε'] else ['ε']))
-
-    reglas = reemplazar_epsilon(reglas)
-
-    # Verificar y eliminar recursión por izquierda
-    if tiene_recursion_izquierda(reglas):
-        reglas = eliminar_recursion_izquierda(reglas)
-        st.warning("⚠️ Recursión por izquierda eliminada.")
-        st.code('\n'.join(f"{izq} -> {' '.join(der)}" for izq, der in reglas), language='bnf')
-
-    # Verificar y factorizar por izquierda
-    if tiene_factorizacion_izquierda(reglas):
-        reglas = factorizar_por_izquierda(reglas)
-        st.warning("⚠️ Gramática factorizada por izquierda.")
-        st.code('\n'.join(f"{izq} -> {' '.join(der)}" for izq, der in reglas), language='bnf')
-
-    # Extraer variables y terminales
-    variables, terminales = extraer_variables_terminales(reglas)
-    inicio = reglas[0][0]
-
-    # Inicializar gramática y calcular FIRST/FOLLOW
-    grammar = inicializar_gramatica(variables, terminales, inicio)
-    calcular_first(reglas, grammar)
-    calcular_follow(reglas, grammar)
-
-    # Construir tabla LL(1)
-    tabla = construir_tabla_ll1(reglas, grammar, terminales)
+    st.session_state["procesado"] = True
+
+if st.session_state.get("procesado"):
+    try:
+        avisos, conflictos, grammar, tabla, inicio, simbolos_df, ll1_df = procesar_gramatica(gram_input)
+    except ErrorGramatica as e:
+        st.error(f"❌ {e}")
+        st.stop()
+    for aviso, reglas_str in avisos:
+        st.warning(aviso)
+        st.code(reglas_str, language='bnf')
+    for conflicto in conflictos:
+        st.error(f"❌ Conflicto LL(1) {conflicto}")
 
     # Mostrar tabla de símbolos
     st.subheader("📊 Tabla de Símbolos")
-    data = []
-    for simbolo, info in grammar.items():
-        if info['tipo'] in ['V', 'I']:
-            data.append({
-                "Símbolo": simbolo,
-                "FIRST": ', '.join(info['first']),
-                "FOLLOW": ', '.join(info['follow'])
-            })
-    st.dataframe(pd.DataFrame(data))
+    st.dataframe(simbolos_df)
 
     # Mostrar tabla LL(1)
     st.subheader("📐 Tabla LL(1)")
-    ll1_data = {nt: {} for nt in tabla}
-    columnas = terminales + ['$']
-
-    for nt in tabla:
-        for t in columnas:
-            reglas_set = tabla[nt][t]
-            if reglas_set:
-                reglas_str = ' | '.join(f"{izq} → {' '.join(der) if der != ('ε',) else 'ε'}" for izq, der in reglas_set)
-                ll1_data[nt][t] = reglas_str
-            else:
-                if t in grammar[nt]['follow']:
-                    ll1_data[nt][t] = 'EXT'
-                else:
-                    ll1_data[nt][t] = 'EXP'
-
-    st.dataframe(pd.DataFrame(ll1_data).fillna("-").T)
+    st.dataframe(ll1_df)
 
     # Analizar cadena y mostrar resultados
     st.subheader("🧾 Análisis de la cadena")
-    analisis_df = analizar_cadena(input_str, tabla, grammar, inicio)
-    st.dataframe(analisis_df)
+    traza = analizar(gram_input, input_str)
+    paginas = max(1, -(-len(traza) // FILAS_POR_PAGINA))
+    pagina = 1
+    if paginas > 1:
+        pagina = st.number_input(f"Página de la traza (de {paginas})", min_value=1,
+                                 max_value=paginas, value=1, step=1)
+    st.caption(f"{len(traza)} pasos — {traza.final}")
+    desde = (pagina - 1) * FILAS_POR_PAGINA
+    st.dataframe(traza_a_dataframe(traza[desde:desde + FILAS_POR_PAGINA]))
 
 # Colaboradores
 st.markdown("---")
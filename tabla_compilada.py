@@ -0,0 +1,152 @@
+# tabla_compilada.py
+from array import array
+from collections import namedtuple
+
+from parser import EPSILON
+
+# Los símbolos se codifican como enteros: los terminales ocupan 0..T-1 ('$' es el último)
+# y el no terminal n se codifica como T + n.
+TablaCompilada = namedtuple("TablaCompilada", [
+    "terminales",     # nombres de los terminales, '$' al final
+    "no_terminales",  # nombres de los no terminales
+    "id_terminal",    # nombre -> id de terminal
+    "producciones",   # (izq, der) para cada id de producción
+    "empujes",        # der invertida y codificada (sin ε) para cada id de producción
+    "celdas",         # celdas[n * T + t] = id de producción o -1
+    "inicio",         # código del símbolo inicial
+])
+
+
+def compilar_tabla(reglas, tabla, inicio):
+    """
+    Compila la tabla LL(1) a una forma indexada por enteros.
+    Cada celda guarda un único id de producción; si hay varias se toma la menor,
+    igual que reconocer_cadena.
+    """
+    no_terminales = list(tabla)
+    columnas = next(iter(tabla.values())) if tabla else {"$": set()}
+    terminales = sorted(t for t in columnas if t != "$") + ["$"]
+    num_t = len(terminales)
+
+    id_terminal = {t: i for i, t in enumerate(terminales)}
+
+    id_produccion = {}
+    producciones = []
+    for izq, der in reglas:
+        regla = (izq, tuple(der))
+        if regla not in id_produccion:
+            id_produccion[regla] = len(producciones)
+            producciones.append(regla)
+
+    celdas = array("i", [-1]) * (len(no_terminales) * num_t)
+    for n, nt in enumerate(no_terminales):
+        for t, reglas_celda in tabla[nt].items():
+            if reglas_celda:
+                regla = min(reglas_celda)
+                if regla not in id_produccion:
+                    id_produccion[regla] = len(producciones)
+                    producciones.append(regla)
+                celdas[n * num_t + id_terminal[t]] = id_produccion[regla]
+
+    return armar_compilada(terminales, no_terminales, producciones, celdas, inicio)
+
+
+def armar_compilada(terminales, no_terminales, producciones, celdas, inicio):
+    """
+    Completa una TablaCompilada a partir de sus partes guardadas (nombres, producciones y celdas).
+    """
+    num_t = len(terminales)
+    id_terminal = {t: i for i, t in enumerate(terminales)}
+    codigo = dict(id_terminal)
+    for n, nt in enumerate(no_terminales):
+        codigo[nt] = num_t + n
+    empujes = [
+        tuple(codigo[s] for s in reversed(der) if s != EPSILON)
+        for _, der in producciones
+    ]
+    return TablaCompilada(terminales, no_terminales, id_terminal, producciones,
+                          empujes, celdas, codigo[inicio])
+
+
+def ids_de_tokens(tokens, compilada):
+    """
+    Id de terminal de cada token, o None si no pertenece al alfabeto. '$' solo marca el fin
+    de la entrada, así que escrito como token también es desconocido.
+    """
+    id_terminal = compilada.id_terminal
+    return [id_terminal.get(t) if t != "$" else None for t in tokens]
+
+
+def mensaje_error(compilada, tope, simbolo):
+    """
+    Mensaje (el mismo que reconocer_cadena) cuando el símbolo de pila `tope` no admite el
+    terminal `simbolo`, ambos como códigos.
+    """
+    num_t = len(compilada.terminales)
+    if tope >= num_t:
+        nt = compilada.no_terminales[tope - num_t]
+        return f"Error: no hay regla para {nt} con '{compilada.terminales[simbolo]}'"
+    if tope == num_t - 1:
+        return "Error: símbolo desconocido en pila"
+    return (f"Error: se esperaba '{compilada.terminales[tope]}' "
+            f"pero se encontró '{compilada.terminales[simbolo]}'")
+
+
+def mensaje_desconocido(tokens, posicion):
+    nombre = tokens[posicion] if tokens is not None else "?"
+    return f"Error: token desconocido '{nombre}'"
+
+
+def reconocer_ids(ids, compilada, estadisticas=None, derivacion=None, tokens=None):
+    """
+    Reconoce una secuencia (o iterador) de ids de terminal sobre la tabla compilada.
+    El '$' final se añade solo. Devuelve (valida, posicion, mensaje) como reconocer_cadena.
+    Un None en `ids` (ver ids_de_tokens) es un token desconocido: el análisis termina en él
+    con ese error; `tokens` da su nombre para el mensaje.
+    Con `derivacion` (un array o una lista) se le añade cada id de producción aplicada: la
+    derivación más a la izquierda, parcial si hay error.
+    Con `estadisticas` (instrumentacion.Estadisticas) se usa la variante que cuenta pasos.
+    """
+    if estadisticas is not None:
+        from instrumentacion import reconocer_ids_instrumentado
+        return reconocer_ids_instrumentado(ids, compilada, estadisticas, tokens, derivacion)
+
+    num_t = len(compilada.terminales)
+    fin = num_t - 1
+    celdas = compilada.celdas
+    empujes = compilada.empujes
+    aplicar = derivacion.append if derivacion is not None else None
+
+    entrada = iter(ids)
+    simbolo = next(entrada, fin)
+    if simbolo is None:
+        return False, 0, mensaje_desconocido(tokens, 0)
+    pila = [fin, compilada.inicio]
+    i = 0
+
+    while True:
+        tope = pila.pop()
+        if tope >= num_t:
+            prod = celdas[(tope - num_t) * num_t + simbolo]
+            if prod < 0:
+                return False, i, mensaje_error(compilada, tope, simbolo)
+            if aplicar is not None:
+                aplicar(prod)
+            pila.extend(empujes[prod])
+        elif tope == simbolo:
+            if tope == fin:
+                return True, None, None
+            i += 1
+            simbolo = next(entrada, fin)
+            if simbolo is None:
+                return False, i, mensaje_desconocido(tokens, i)
+        else:
+            return False, i, mensaje_error(compilada, tope, simbolo)
+
+
+def reconocer_compilado(cadena, compilada, estadisticas=None):
+    """
+    Equivalente a reconocer_cadena sobre la tabla compilada.
+    """
+    tokens = cadena.split()
+    return reconocer_ids(ids_de_tokens(tokens, compilada), compilada, estadisticas, tokens=tokens)
@@ -0,0 +1,352 @@
+# transformaciones.py
+# Eliminación de recursión por izquierda (directa e indirecta) y factorización por
+# izquierda hasta punto fijo, para gramáticas grandes generadas automáticamente.
+from collections import defaultdict
+
+from conjuntos import calcular_anulables, componentes_fuertes
+from parser import EPSILON, es_variable
+
+
+def _agrupar(reglas):
+    # Producciones por no terminal sin repetidas y con ε como lista vacía
+    agrupadas = defaultdict(list)
+    vistas = set()
+    for izq, der in reglas:
+        der = [s for s in der if s != EPSILON]
+        if (izq, tuple(der)) not in vistas:
+            vistas.add((izq, tuple(der)))
+            agrupadas[izq].append(der)
+    return agrupadas
+
+
+def _desagrupar(agrupadas):
+    return [(izq, der or [EPSILON]) for izq, ders in agrupadas.items() for der in ders]
+
+
+def _nombre_nuevo(base, usados):
+    """
+    Primer nombre base', base'', ... que no esté en uso; lo marca como usado.
+    """
+    nombre = base + "'"
+    while nombre in usados:
+        nombre += "'"
+    usados.add(nombre)
+    return nombre
+
+
+def _eliminar_directa(nt, prods, usados):
+    """
+    A -> A α | β  pasa a  A -> β A', A' -> α A' | ε. Las producciones A -> A se descartan.
+    Sin ningún β, A no genera ninguna cadena: se queda sin producciones y no se crea A'.
+    Devuelve (producciones de A, nuevo no terminal o None, producciones del nuevo).
+    """
+    recursivas = [p for p in prods if p and p[0] == nt]
+    if not recursivas:
+        return prods, None, []
+    if len(recursivas) == len(prods):
+        return [], None, []
+    directas = [p[1:] for p in recursivas if len(p) > 1]
+    nuevo = _nombre_nuevo(nt, usados)
+    indirectas = [p + [nuevo] for p in prods if not p or p[0] != nt]
+    return indirectas, nuevo, [alpha + [nuevo] for alpha in directas] + [[]]
+
+
+def _comprobar_escondida(agrupadas):
+    """
+    Lanza ValueError si algún ciclo de recursión por izquierda pasa por un prefijo anulable
+    (A -> B A con B anulable): el algoritmo clásico no termina en ese caso.
+    """
+    anulables = calcular_anulables(_desagrupar(agrupadas), EPSILON)
+    esquinas = defaultdict(set)
+    escondidas = []
+    for nt, prods in agrupadas.items():
+        for p in prods:
+            for k, s in enumerate(p):
+                if s in agrupadas:
+                    esquinas[nt].add(s)
+                    if k > 0:
+                        escondidas.append((nt, s))
+                if s not in anulables:
+                    break
+    componente = {}
+    for i, c in enumerate(componentes_fuertes(list(agrupadas), esquinas)):
+        for nt in c:
+            componente[nt] = i
+    for nt, s in escondidas:
+        if componente[nt] == componente[s]:
+            raise ValueError(f"Recursión por izquierda escondida tras símbolos anulables en {nt} -> ... {s}")
+
+
+def eliminar_recursion_indirecta(reglas):
+    """
+    Elimina toda la recursión por izquierda con el algoritmo clásico: con los no terminales
+    ordenados A1..An, en cada Ai se sustituyen las producciones que empiezan por Aj (j < i)
+    y después se quita la recursión directa. Solo se sustituye dentro de cada componente
+    fuertemente conexa del grafo de esquinas izquierdas (A -> B si alguna producción de A
+    empieza por B), que es donde puede haber ciclos; el resto de la gramática se copia tal
+    cual. Como el algoritmo clásico, no admite recursión escondida tras prefijos anulables
+    (lanza ValueError). Un no terminal cuyas producciones son todas recursivas no genera
+    nada y se queda sin producciones; si es el inicial se lanza ValueError.
+    """
+    inicio = reglas[0][0]
+    agrupadas = _agrupar(reglas)
+    usados = set(agrupadas)
+    for _, der in reglas:
+        usados.update(der)
+
+    esquinas = {nt: {p[0] for p in prods if p and p[0] in agrupadas}
+                for nt, prods in agrupadas.items()}
+    _comprobar_escondida(agrupadas)
+    orden = {nt: i for i, nt in enumerate(agrupadas)}
+    nuevas = {}
+    for componente in componentes_fuertes(list(agrupadas), esquinas):
+        if len(componente) == 1 and componente[0] not in esquinas[componente[0]]:
+            continue
+        # Orden de la gramática original dentro de la componente
+        componente.sort(key=orden.get)
+        posicion = {nt: i for i, nt in enumerate(componente)}
+        for i, ai in enumerate(componente):
+            prods = agrupadas[ai]
+            # Sustituir mientras alguna empiece por un Aj anterior; al estar Aj ya tratado,
+            # sus producciones empiezan por Ak con k > j y el proceso termina
+            while any(p and posicion.get(p[0], i) < i for p in prods):
+                sustituidas = []
+                vistas = set()
+                for p in prods:
+                    nuevas_p = [q + p[1:] for q in agrupadas[p[0]]] if p and posicion.get(p[0], i) < i else [p]
+                    for q in nuevas_p:
+                        if tuple(q) not in vistas:
+                            vistas.add(tuple(q))
+                            sustituidas.append(q)
+                prods = sustituidas
+            prods, nuevo, prods_nuevo = _eliminar_directa(ai, prods, usados)
+            agrupadas[ai] = prods
+            if nuevo:
+                nuevas[ai] = (nuevo, prods_nuevo)
+
+    if not agrupadas[inicio]:
+        raise ValueError(f"El símbolo inicial {inicio} no genera ninguna cadena: "
+                         f"todas sus producciones son recursivas por izquierda")
+    resultado = {}
+    for nt, prods in agrupadas.items():
+        resultado[nt] = prods
+        if nt in nuevas:
+            nuevo, prods_nuevo = nuevas[nt]
+            resultado[nuevo] = prods_nuevo
+    return _desagrupar(resultado)
+
+
+def factorizar_trie(reglas):
+    """
+    Factorización por izquierda por el prefijo común más largo. Las producciones de cada no
+    terminal se insertan en un trie; cada nodo con más de una salida (o que además cierra una
+    producción) después de un prefijo no vacío genera un no terminal nuevo con los sufijos.
+    En una pasada ninguna pareja de producciones de un mismo no terminal comparte el primer
+    símbolo. Las producciones vacías se conservan como ε.
+    """
+    agrupadas = _agrupar(reglas)
+    usados = set(agrupadas)
+    for _, der in reglas:
+        usados.update(der)
+
+    resultado = {}
+    for nt, prods in agrupadas.items():
+        trie = {}
+        for p in prods:
+            nodo = trie
+            for s in p:
+                nodo = nodo.setdefault(s, {})
+            nodo[None] = True
+
+        pendientes = [(nt, trie)]
+        for izq, raiz in pendientes:
+            salida = resultado.setdefault(izq, [])
+            for simbolo, hijo in raiz.items():
+                if simbolo is None:
+                    salida.append([])
+                    continue
+                # Se baja por la cadena sin ramificaciones: ese es el prefijo común
+                prefijo = [simbolo]
+                while len(hijo) == 1 and None not in hijo:
+                    siguiente, hijo = next(iter(hijo.items()))
+                    prefijo.append(siguiente)
+                if len(hijo) == 1:
+                    salida.append(prefijo)
+                else:
+                    nuevo = _nombre_nuevo(nt, usados)
+                    salida.append(prefijo + [nuevo])
+                    pendientes.append((nuevo, hijo))
+    return _desagrupar(resultado)
+
+
+def tiene_recursion_indirecta(reglas):
+    """
+    True si el grafo de esquinas izquierdas tiene algún ciclo (incluye la recursión directa).
+    """
+    agrupadas = _agrupar(reglas)
+    esquinas = {nt: {p[0] for p in prods if p and p[0] in agrupadas}
+                for nt, prods in agrupadas.items()}
+    return any(len(c) > 1 or c[0] in esquinas[c[0]]
+               for c in componentes_fuertes(list(agrupadas), esquinas))
+
+
+def transformar_gramatica(reglas, max_iteraciones=20):
+    """
+    Alterna eliminación de recursión por izquierda y factorización hasta que la gramática
+    deja de cambiar. Devuelve (reglas, pasos), donde pasos lista lo aplicado en orden
+    ("recursión" o "factorización").
+    """
+    pasos = []
+    reglas = _desagrupar(_agrupar(reglas))
+    for _ in range(max_iteraciones):
+        cambio = False
+        if tiene_recursion_indirecta(reglas):
+            reglas = eliminar_recursion_indirecta(reglas)
+            pasos.append("recursión")
+            cambio = True
+        factorizadas = factorizar_trie(reglas)
+        if factorizadas != reglas:
+            reglas = factorizadas
+            pasos.append("factorización")
+            cambio = True
+        if not cambio:
+            break
+    return reglas, pasos
+
+
+def _generadores(agrupadas):
+    # Un no terminal genera si alguna producción tiene solo terminales o no terminales que generan
+    pendientes = {}
+    apariciones = defaultdict(list)
+    trabajo = []
+    for nt, prods in agrupadas.items():
+        for k, p in enumerate(prods):
+            variables = [s for s in p if es_variable(s)]
+            pendientes[nt, k] = len(variables)
+            for s in variables:
+                apariciones[s].append((nt, k))
+            if not variables:
+                trabajo.append(nt)
+    generadores = set()
+    while trabajo:
+        nt = trabajo.pop()
+        if nt in generadores:
+            continue
+        generadores.add(nt)
+        for clave in apariciones[nt]:
+            pendientes[clave] -= 1
+            if pendientes[clave] == 0:
+                trabajo.append(clave[0])
+    return generadores
+
+
+def _alcanzables(agrupadas, inicio):
+    alcanzables = {inicio}
+    pendientes = [inicio]
+    while pendientes:
+        nt = pendientes.pop()
+        for p in agrupadas.get(nt, ()):
+            for s in p:
+                if s in agrupadas and s not in alcanzables:
+                    alcanzables.add(s)
+                    pendientes.append(s)
+    return alcanzables
+
+
+def _quitar_inutiles(agrupadas, inicio, informe):
+    generadores = _generadores(agrupadas)
+    if inicio not in generadores:
+        raise ValueError(f"El símbolo inicial {inicio} no genera ninguna cadena")
+    for nt in list(agrupadas):
+        if nt not in generadores:
+            informe["no_generadores"].append(nt)
+            del agrupadas[nt]
+        else:
+            agrupadas[nt] = [p for p in agrupadas[nt]
+                             if all(s in generadores or not es_variable(s) for s in p)]
+    alcanzables = _alcanzables(agrupadas, inicio)
+    for nt in list(agrupadas):
+        if nt not in alcanzables:
+            informe["inalcanzables"].append(nt)
+            del agrupadas[nt]
+
+
+def _colapsar_unitarias(agrupadas, bloqueados):
+    """
+    Sustituye cada A -> B (B no bloqueado) por las producciones de B, siguiendo cadenas
+    A -> B -> C. Devuelve (producciones nuevas por no terminal, pares (A, B) colapsados).
+    """
+    colapsadas = {}
+    pares = []
+    for nt in agrupadas:
+        nuevas = []
+        vistas = set()
+        visitados = {nt}
+        pendientes = [nt]
+        while pendientes:
+            x = pendientes.pop()
+            for p in agrupadas[x]:
+                if len(p) == 1 and p[0] in agrupadas and p[0] not in bloqueados:
+                    if x == nt:
+                        pares.append((nt, p[0]))
+                    if p[0] not in visitados:
+                        visitados.add(p[0])
+                        pendientes.append(p[0])
+                    continue
+                if p != [nt] and tuple(p) not in vistas:
+                    vistas.add(tuple(p))
+                    nuevas.append(p)
+        colapsadas[nt] = nuevas
+    return colapsadas, pares
+
+
+def simplificar_gramatica(reglas):
+    """
+    Quita los no terminales que no generan ninguna cadena, los inalcanzables desde el
+    inicial y las producciones unitarias A -> B (A pasa a tener directamente las
+    producciones de B), con sus terminales. Una producción unitaria solo se colapsa si la
+    fila de B en la tabla LL(1) no tiene conflictos: A hereda producciones que ya se
+    distinguían entre sí, así que los conflictos no aumentan (se comprueba con
+    detectar_conflictos y, si aumentaran, se deshace ese paso). Se repite mientras quede
+    algo que colapsar. Devuelve (reglas, informe), donde informe lista lo eliminado y
+    el número de conflictos antes y después.
+    """
+    from parser import detectar_conflictos, preparar_gramatica
+
+    inicio = reglas[0][0]
+    informe = {"no_generadores": [], "inalcanzables": [], "unitarias": [],
+               "terminales": [], "conflictos": None}
+    terminales_antes = {s for _, der in reglas for s in der if not es_variable(s) and s != EPSILON}
+
+    agrupadas = _agrupar(reglas)
+    for nt, prods in agrupadas.items():
+        if [nt] in prods:
+            # A -> A no aporta nada (y es un conflicto seguro)
+            prods.remove([nt])
+            informe["unitarias"].append((nt, nt))
+    _quitar_inutiles(agrupadas, inicio, informe)
+    actuales = _desagrupar(agrupadas)
+    grammar, tabla, _, _ = preparar_gramatica(actuales)
+    conflictos = detectar_conflictos(tabla, grammar)
+    antes = len(conflictos)
+
+    while True:
+        bloqueados = {nt for nt, _, _, _ in conflictos}
+        colapsadas, pares = _colapsar_unitarias(agrupadas, bloqueados)
+        if not pares:
+            break
+        parcial = {"no_generadores": [], "inalcanzables": []}
+        _quitar_inutiles(colapsadas, inicio, parcial)
+        candidatas = _desagrupar(colapsadas)
+        grammar, tabla, _, _ = preparar_gramatica(candidatas)
+        nuevos = detectar_conflictos(tabla, grammar)
+        if len(nuevos) > len(conflictos) or candidatas == actuales:
+            break
+        agrupadas, actuales, conflictos = colapsadas, candidatas, nuevos
+        informe["unitarias"].extend(pares)
+        informe["inalcanzables"].extend(parcial["inalcanzables"])
+
+    terminales_despues = {s for _, der in actuales for s in der if not es_variable(s) and s != EPSILON}
+    informe["terminales"] = sorted(terminales_antes - terminales_despues)
+    informe["conflictos"] = (antes, len(conflictos))
+    return actuales, informe
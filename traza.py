@@ -0,0 +1,152 @@
+# traza.py
+from array import array
+
+from parser import EPSILON
+
+PASO_MATCH = -1
+
+
+class TrazaPerezosa:
+    """
+    Seguimiento LL(1) con las mismas filas (pila, entrada, acción) que parser.trazar_cadena,
+    pero sin guardarlas. Del análisis solo queda un registro compacto: un entero por paso
+    (id de producción aplicada o PASO_MATCH) y una referencia a la pila (persistente, sus
+    nodos se comparten) cada `intervalo` pasos.
+    Las filas se reconstruyen al pedirlas (traza[k], traza[a:b] o filas(a, b)) repitiendo
+    a lo sumo `intervalo` pasos desde el punto de control anterior.
+
+    Con max_simbolos se recortan la pila (por el fondo) y la entrada (por el final) a ese
+    número de símbolos, para que el coste de cada fila no dependa del largo de la entrada.
+    """
+
+    def __init__(self, cadena, tabla, grammar, inicio, intervalo=256, max_simbolos=None):
+        self.tokens = cadena.strip().split() + ["$"]
+        self.intervalo = intervalo
+        self.max_simbolos = max_simbolos
+        self.producciones = []
+        self.pasos = array("i")
+        self.puntos = []
+        self.valida = False
+        self.final = None
+        self._registrar(tabla, grammar, inicio)
+
+    def _registrar(self, tabla, grammar, inicio):
+        tokens = self.tokens
+        ultimo = len(tokens) - 1
+        pasos = self.pasos
+        intervalo = self.intervalo
+        id_produccion = {}
+        # Pila persistente: cada nodo es (símbolo, nodo de debajo). Los nodos no se modifican,
+        # así que un punto de control es solo una referencia al tope, sin copiar la pila.
+        pila = (inicio, ("$", None))
+        pos = 0
+
+        while True:
+            if len(pasos) == len(self.puntos) * intervalo:
+                self.puntos.append((pila, pos))
+
+            if pila is None:
+                self.final = "Error: pila vacía"
+                return
+            tope, debajo = pila
+            if debajo is None and tope == "$" and pos == ultimo:
+                self.valida = True
+                self.final = "CADENA VÁLIDA"
+                return
+
+            simbolo = tokens[pos]
+            tipo = grammar.get(tope, {}).get("tipo")
+            if tipo in ("I", "V"):
+                reglas = tabla[tope].get(simbolo)
+                if not reglas:
+                    self.final = f"Error: no hay regla para {tope} con '{simbolo}'"
+                    return
+                regla = min(reglas)  # Con conflictos se elige siempre la misma regla
+                prod = id_produccion.get(regla)
+                if prod is None:
+                    prod = id_produccion[regla] = len(self.producciones)
+                    self.producciones.append(regla)
+                pila = debajo
+                if list(regla[1]) != [EPSILON]:
+                    for s in reversed(regla[1]):
+                        pila = (s, pila)
+                pasos.append(prod)
+            elif tipo == "T":
+                if tope != simbolo:
+                    self.final = f"Error: se esperaba '{tope}' pero se encontró '{simbolo}'"
+                    return
+                pila = debajo
+                pos += 1
+                pasos.append(PASO_MATCH)
+            else:
+                self.final = "Error: símbolo desconocido en pila"
+                return
+
+    def __len__(self):
+        return len(self.pasos) + (1 if self.valida else 2)
+
+    def __iter__(self):
+        return self.filas(0, len(self))
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fin, salto = indice.indices(len(self))
+            if salto != 1:
+                return list(self.filas(inicio, fin))[::salto]
+            return list(self.filas(inicio, fin))
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("fila de la traza fuera de rango")
+        return next(self.filas(indice, indice + 1))
+
+    def _texto(self, pila, pos):
+        n = self.max_simbolos
+        if n is None:
+            return ' '.join(pila), ' '.join(self.tokens[pos:])
+        pila_str = ' '.join(pila[-n:])
+        if len(pila) > n:
+            pila_str = "… " + pila_str
+        entrada_str = ' '.join(self.tokens[pos:pos + n])
+        if len(self.tokens) - pos > n:
+            entrada_str += " …"
+        return pila_str, entrada_str
+
+    def filas(self, inicio, fin):
+        """
+        Genera las filas inicio..fin-1 reconstruyendo la pila desde el punto de control anterior.
+        """
+        fin = min(fin, len(self))
+        if inicio >= fin:
+            return
+        n = len(self.pasos)
+        k = min(inicio, n) // self.intervalo * self.intervalo
+        nodo, pos = self.puntos[k // self.intervalo]
+        pila = []
+        while nodo is not None:
+            pila.append(nodo[0])
+            nodo = nodo[1]
+        pila.reverse()
+        tokens = self.tokens
+        producciones = self.producciones
+
+        while k < min(fin, n):
+            prod = self.pasos[k]
+            pila.pop()
+            if prod == PASO_MATCH:
+                accion = f"Match: {tokens[pos]}"
+                pos += 1
+            else:
+                izq, der = producciones[prod]
+                if list(der) != [EPSILON]:
+                    pila.extend(reversed(der))
+                accion = f"Regla: {izq} → {' '.join(der) if list(der) != [EPSILON] else EPSILON}"
+            if k >= inicio:
+                yield self._texto(pila, pos) + (accion,)
+            k += 1
+
+        # Filas de cierre: resultado o error y "CADENA NO VÁLIDA"
+        if inicio <= n < fin:
+            yield self._texto(pila, pos) + (self.final,)
+        if not self.valida and inicio <= n + 1 < fin:
+            yield ("", "", "CADENA NO VÁLIDA")